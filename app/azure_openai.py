@@ -1,12 +1,76 @@
 """Lightweight Azure OpenAI client helpers."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
-import requests
+import httpx
+import orjson
+from cachetools import TTLCache
+from tenacity import before_sleep_log, retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 from .config import get_settings
 
+logger = logging.getLogger(__name__)
+
+_TIMEOUT = 20
+_TRANSPORT_RETRIES = 3
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+# Identical prompts (same messages/temperature/format) are answered from memory for an hour.
+_response_cache: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+_response_cache_lock = threading.Lock()
+
+# Process-wide client so TCP/TLS connections to the AOAI endpoint are reused across calls.
+# Created lazily and dropped by close() on application shutdown.
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    global _client
+    client = _client
+    if client is None or client.is_closed:
+        # Reached from worker threads; the lock keeps concurrent first calls from building two clients.
+        with _client_lock:
+            client = _client
+            if client is None or client.is_closed:
+                client = _client = httpx.Client(
+                    timeout=_TIMEOUT,
+                    transport=httpx.HTTPTransport(
+                        http2=True,
+                        retries=_TRANSPORT_RETRIES,
+                        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60),
+                    ),
+                )
+    return client
+
+
+def close() -> None:
+    """Close the pooled HTTP client; called from the FastAPI lifespan on shutdown."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def _is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(min=1, max=20),
+    retry=retry_if_exception(_is_transient),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
 
 def is_configured() -> bool:
     settings = get_settings()
@@ -15,6 +79,18 @@ def is_configured() -> bool:
 
 def chat_completion(messages: List[Dict[str, str]], *, response_format: Optional[Dict[str, Any]] = None, temperature: float = 0.0) -> str:
     """Call Azure OpenAI chat completions and return the message content."""
+    key = _cache_key(messages, response_format, temperature)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    content = _post(*_build_request(messages, response_format, temperature))
+    _cache_set(key, content)
+    return content
+
+
+def _build_request(
+    messages: List[Dict[str, str]], response_format: Optional[Dict[str, Any]], temperature: float
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
     settings = get_settings()
     if not is_configured():
         raise RuntimeError("Azure OpenAI is not configured")
@@ -30,7 +106,30 @@ def chat_completion(messages: List[Dict[str, str]], *, response_format: Optional
     payload: Dict[str, Any] = {"messages": messages, "temperature": temperature}
     if response_format is not None:
         payload["response_format"] = response_format
-    response = requests.post(url, json=payload, headers=headers, timeout=20)
+    return url, headers, payload
+
+
+@_retry
+def _post(url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> str:
+    response = _get_client().post(url, content=orjson.dumps(payload), headers=headers)
     response.raise_for_status()
-    data = response.json()
+    return _extract_content(orjson.loads(response.content))
+
+
+def _cache_key(messages: List[Dict[str, str]], response_format: Optional[Dict[str, Any]], temperature: float) -> str:
+    raw = orjson.dumps({"m": messages, "t": temperature, "rf": response_format}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(raw).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    with _response_cache_lock:
+        return _response_cache.get(key)
+
+
+def _cache_set(key: str, content: str) -> None:
+    with _response_cache_lock:
+        _response_cache[key] = content
+
+
+def _extract_content(data: Dict[str, Any]) -> str:
     return data.get("choices", [{}])[0].get("message", {}).get("content", "") or ""
@@ -2,142 +2,215 @@
 from __future__ import annotations
 
 import contextlib
-from typing import Any, List, Optional
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+
+try:  # pragma: no cover - optional dependency during import
+    import pyodbc
+except ImportError:  # pragma: no cover - demo mode without ODBC
+    pyodbc = None
 
 from .db import open_sql_connection, sql_connection_available
 from .schemas import ColumnMetadata
 
-NUMERIC_TYPES = {"int", "bigint", "smallint", "tinyint", "decimal", "numeric", "money", "float", "real", "smallmoney"}
-DATE_TYPES = {"date", "datetime", "datetime2", "smalldatetime", "time", "datetimeoffset"}
+NUMERIC_TYPES = frozenset({"int", "bigint", "smallint", "tinyint", "decimal", "numeric", "money", "float", "real", "smallmoney"})
+DATE_TYPES = frozenset({"date", "datetime", "datetime2", "smalldatetime", "time", "datetimeoffset"})
+
+# Catalog metadata changes rarely; keep it for a few minutes instead of rescanning per request.
+_databases_cache: TTLCache = TTLCache(maxsize=1, ttl=300)
+_columns_cache: TTLCache = TTLCache(maxsize=32, ttl=300)
+_cache_lock = threading.RLock()
+# Bumped on every invalidation so results derived from the catalog can key on it.
+_generation = 0
+
+_FETCH_BATCH = 1000
 
 
 def _conn(database: Optional[str] = None):
-    return open_sql_connection(database or None)
+    # Catalog queries are fixed reads, so they skip the implicit transaction.
+    return open_sql_connection(database or None, autocommit=True)
 
 
 def list_databases() -> list[dict[str, str]]:
     if not sql_connection_available():
-        return [{"name": "DemoDW"}]
+        return [dict(entry) for entry in _DEMO_DATABASES]
+    return [dict(entry) for entry in _fetch_databases()]
+
+
+def list_columns(db: str) -> List[ColumnMetadata]:
+    if not sql_connection_available():
+        return _demo_columns()
+    return list(_fetch_columns(db))
+
+
+def catalog_generation() -> int:
+    """Return a counter that changes whenever cached catalog metadata is invalidated."""
+    return _generation
+
+
+def invalidate_catalog(db: Optional[str] = None) -> None:
+    """Drop cached catalog metadata for ``db``, or everything when ``db`` is None."""
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        if db is None:
+            _databases_cache.clear()
+            _columns_cache.clear()
+        else:
+            _columns_cache.pop(hashkey(db), None)
+
+
+@cached(_databases_cache, key=lambda: hashkey(), lock=_cache_lock)
+def _fetch_databases() -> list[dict[str, str]]:
     with contextlib.closing(_conn()) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT name FROM sys.databases WHERE database_id > 4")
         return [{"name": row[0]} for row in cursor.fetchall()]
 
 
-def list_columns(db: str) -> List[ColumnMetadata]:
+def iter_columns(db: str) -> Iterator[ColumnMetadata]:
+    """Stream column metadata for ``db`` in ``fetchmany`` batches, bypassing the cache."""
     if not sql_connection_available():
-        return _demo_columns()
+        yield from _demo_columns()
+        return
     query = (
         "SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE "
         "FROM INFORMATION_SCHEMA.COLUMNS ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION"
     )
-    columns: List[ColumnMetadata] = []
     with contextlib.closing(_conn(db)) as conn:
         cursor = conn.cursor()
+        cursor.arraysize = _FETCH_BATCH
         cursor.execute(query)
-        for schema, table, column, data_type in cursor.fetchall():
-            qualified = f"{schema}.{table}.{column}"
-            bracketed = f"[{schema}].[{table}].[{column}]"
-            columns.append(
-                ColumnMetadata(
+        while True:
+            rows = cursor.fetchmany(cursor.arraysize)
+            if not rows:
+                break
+            for schema, table, column, data_type in rows:
+                type_key = data_type.lower() if data_type else ""
+                yield ColumnMetadata(
                     schema=schema,
                     table=table,
                     column=column,
                     dataType=data_type,
-                    isNumeric=_is_numeric_type(data_type),
-                    isDateLike=_is_date_type(data_type),
+                    isNumeric=type_key in NUMERIC_TYPES,
+                    isDateLike=type_key in DATE_TYPES,
+                    # Samples stay empty here: fetching them would add a scan per table to
+                    # every catalog load. Callers that need them use sample_values().
                     sampleValues=None,
-                    name=qualified,
-                    bracketedName=bracketed,
+                    name=f"{schema}.{table}.{column}",
+                    bracketedName=f"[{schema}].[{table}].[{column}]",
                 )
-            )
-    return columns
-
 
 
+@cached(_columns_cache, key=lambda db: hashkey(db), lock=_cache_lock)
+def _fetch_columns(db: str) -> List[ColumnMetadata]:
+    return list(iter_columns(db))
 
 
 def sample_values(db: str, column: str, limit: int = 5) -> list[str]:
     if not sql_connection_available():
-        return ["North", "South"] if "Region" in column else ["1000", "2000"]
+        return list(_DEMO_REGION_SAMPLES if "Region" in column else _DEMO_NUMERIC_SAMPLES)
     schema_table, col = column.rsplit(".", 1)
     schema, table = schema_table.split(".")
-    query = f"SELECT TOP {limit} [{col}] FROM {schema}.{table} WHERE [{col}] IS NOT NULL"
+    quoted_col = _quote_identifier(col)
+    # TOP is parameterized so every limit shares one cached plan per column.
+    query = (
+        f"SELECT TOP (?) {quoted_col} FROM {_quote_identifier(schema)}.{_quote_identifier(table)} "
+        f"WHERE {quoted_col} IS NOT NULL"
+    )
     with contextlib.closing(_conn(db)) as conn:
         cursor = conn.cursor()
-        cursor.execute(query)
+        if pyodbc is not None:
+            cursor.setinputsizes([(pyodbc.SQL_INTEGER, 0, 0)])
+        cursor.execute(query, int(limit))
         return [str(row[0]) for row in cursor.fetchall()]
 
 
+def _quote_identifier(name: str) -> str:
+    return "[" + name.replace("]", "]]") + "]"
+
+
 def map_sql_type_to_rdl(sql_type: Optional[str]) -> str:
     if not sql_type:
         return "String"
     sql_type = sql_type.lower()
-    if any(t in sql_type for t in ("char", "text", "xml")):
-        return "String"
-    if any(t in sql_type for t in ("date", "time")):
-        return "DateTime"
-    if any(t in sql_type for t in ("int", "numeric", "decimal", "money", "float", "real")):
-        return "Float"
-    if "bit" in sql_type:
-        return "Boolean"
-    return "String"
+    rdl_type = _RDL_TYPE_MAP.get(sql_type)
+    return rdl_type if rdl_type is not None else _classify_rdl_type(sql_type)
 
 
-def _get_tuple_value(row: Any, index: int) -> Optional[str]:
-    if isinstance(row, dict):
-        # Safety: handle environments that still return dicts
-        return row.get("name") if index == 2 else row.get("system_type_name")
-    if isinstance(row, (list, tuple)) and len(row) > index:
-        value = row[index]
-        return value if value is not None else None
-    return None
+_RDL_TYPE_PATTERNS = (
+    (re.compile(r"char|text|xml"), "String"),
+    (re.compile(r"date|time"), "DateTime"),
+    (re.compile(r"int|numeric|decimal|money|float|real"), "Float"),
+    (re.compile(r"bit"), "Boolean"),
+)
 
 
-def _is_numeric_type(data_type: str) -> bool:
-    return data_type.lower() in NUMERIC_TYPES
+def _classify_rdl_type(sql_type: str) -> str:
+    for pattern, rdl_type in _RDL_TYPE_PATTERNS:
+        if pattern.search(sql_type):
+            return rdl_type
+    return "String"
 
 
-def _is_date_type(data_type: str) -> bool:
-    return data_type.lower() in DATE_TYPES
+# INFORMATION_SCHEMA reports bare type names, so nearly every lookup is a single dict hit.
+_RDL_TYPE_MAP = {
+    name: _classify_rdl_type(name)
+    for name in NUMERIC_TYPES
+    | DATE_TYPES
+    | {"bit", "char", "varchar", "nchar", "nvarchar", "text", "ntext", "xml", "uniqueidentifier", "binary", "varbinary"}
+}
+
+
+# Demo fallbacks are built once at import; callers get fresh list copies.
+_DEMO_COLUMNS: Tuple[ColumnMetadata, ...] = (
+    ColumnMetadata(
+        schema="dbo",
+        table="FactSales",
+        column="OrderDate",
+        dataType="datetime",
+        isNumeric=False,
+        isDateLike=True,
+        sampleValues=["2024-01-01", "2024-01-02"],
+        name="dbo.FactSales.OrderDate",
+        bracketedName="[dbo].[FactSales].[OrderDate]",
+    ),
+    ColumnMetadata(
+        schema="dbo",
+        table="FactSales",
+        column="Region",
+        dataType="nvarchar",
+        isNumeric=False,
+        isDateLike=False,
+        sampleValues=["West", "South"],
+        name="dbo.FactSales.Region",
+        bracketedName="[dbo].[FactSales].[Region]",
+    ),
+    ColumnMetadata(
+        schema="dbo",
+        table="FactSales",
+        column="SalesAmount",
+        dataType="money",
+        isNumeric=True,
+        isDateLike=False,
+        sampleValues=["1000", "2500"],
+        name="dbo.FactSales.SalesAmount",
+        bracketedName="[dbo].[FactSales].[SalesAmount]",
+    ),
+)
+
+
+_DEMO_DATABASES: Tuple[Dict[str, str], ...] = ({"name": "DemoDW"},)
+_DEMO_REGION_SAMPLES: Tuple[str, ...] = ("North", "South")
+_DEMO_NUMERIC_SAMPLES: Tuple[str, ...] = ("1000", "2000")
 
 
 def _demo_columns() -> List[ColumnMetadata]:
-    return [
-        ColumnMetadata(
-            schema="dbo",
-            table="FactSales",
-            column="OrderDate",
-            dataType="datetime",
-            isNumeric=False,
-            isDateLike=True,
-            sampleValues=["2024-01-01", "2024-01-02"],
-            name="dbo.FactSales.OrderDate",
-            bracketedName="[dbo].[FactSales].[OrderDate]",
-        ),
-        ColumnMetadata(
-            schema="dbo",
-            table="FactSales",
-            column="Region",
-            dataType="nvarchar",
-            isNumeric=False,
-            isDateLike=False,
-            sampleValues=["West", "South"],
-            name="dbo.FactSales.Region",
-            bracketedName="[dbo].[FactSales].[Region]",
-        ),
-        ColumnMetadata(
-            schema="dbo",
-            table="FactSales",
-            column="SalesAmount",
-            dataType="money",
-            isNumeric=True,
-            isDateLike=False,
-            sampleValues=["1000", "2500"],
-            name="dbo.FactSales.SalesAmount",
-            bracketedName="[dbo].[FactSales].[SalesAmount]",
-        ),
-    ]
+    return list(_DEMO_COLUMNS)
 
 
 def demo_columns() -> List[ColumnMetadata]:
@@ -1,8 +1,9 @@
 """Application configuration powered by environment variables."""
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Any, Dict, Tuple
+import re
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -14,6 +15,7 @@ load_dotenv()
 class Settings(BaseSettings):
     """Central application settings backed by environment variables."""
 
+    api_key: str = Field(default="", alias="API_KEY")
     sql_conn_str: str = Field(default="", alias="SQLSERVER_CONN_STR")
     sql_server_host: str = Field(default="", alias="SQLSERVER_HOST")
     sql_server_database: str = Field(default="", alias="SQLSERVER_DATABASE")
@@ -29,12 +31,16 @@ class Settings(BaseSettings):
         default="http://your-ssrs/ReportServer/ReportService2010.asmx?wsdl",
         alias="SSRS_SOAP_WSDL",
     )
+    ssrs_wsdl_cache_path: str = Field(default="", alias="SSRS_WSDL_CACHE_PATH")
     report_folder: str = Field(default="/AutoReports", alias="SSRS_REPORT_FOLDER")
     shared_ds_path: str = Field(default="/_Shared/MainDS", alias="SHARED_DS_PATH")
     render_base: str = Field(default="http://your-ssrs/ReportServer", alias="SSRS_RENDER_BASE")
     server_host: str = Field(default="0.0.0.0", alias="SERVER_HOST")
     server_port: int = Field(default=8000, alias="SERVER_PORT")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    worker_threads: int = Field(default=64, alias="WORKER_THREADS")
+    max_sql_chars: int = Field(default=100_000, alias="MAX_SQL_CHARS")
+    sql_denied_keywords: str = Field(default="WAITFOR,DBCC,BACKUP", alias="SQL_DENIED_KEYWORDS")
 
     model_config = SettingsConfigDict(populate_by_name=True, extra="ignore")
 
@@ -78,7 +84,7 @@ class Settings(BaseSettings):
         if trust is not None:
             self.sql_trust_server_certificate = _parse_bool(trust, default=self.sql_trust_server_certificate)
 
-    @property
+    @cached_property
     def has_sql_credentials(self) -> bool:
         return bool(
             self.sql_server_host
@@ -87,9 +93,22 @@ class Settings(BaseSettings):
             and self.sql_server_password
         )
 
-    @property
+    @cached_property
+    def sql_server_address(self) -> str:
+        """Return the ``host,port`` server value embedded in generated data sources (computed once)."""
+        return f"{self.sql_server_host},{self.sql_server_port}"
+
+    @cached_property
+    def sql_denied_keywords_re(self) -> Optional[re.Pattern[str]]:
+        """Return a compiled matcher for ``SQL_DENIED_KEYWORDS``, or None when the list is empty."""
+        keywords = [keyword.strip() for keyword in self.sql_denied_keywords.split(",") if keyword.strip()]
+        if not keywords:
+            return None
+        return re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+    @cached_property
     def resolved_sql_conn_str(self) -> str:
-        """Return the connection string derived from env or provided directly."""
+        """Return the connection string derived from env or provided directly (computed once)."""
         if self.sql_conn_str:
             return self.sql_conn_str
         if not self.has_sql_credentials:
@@ -111,14 +130,11 @@ class Settings(BaseSettings):
 
 
 def _parse_sql_connection_string(conn_str: str) -> Dict[str, str]:
-    parsed: Dict[str, str] = {}
-    for part in conn_str.split(";"):
-        part = part.strip()
-        if not part or "=" not in part:
-            continue
-        key, _, value = part.partition("=")
-        parsed[key.strip().lower()] = value.strip().strip("'\"")
-    return parsed
+    return {
+        key.strip().lower(): value.strip().strip("'\"")
+        for key, sep, value in (part.partition("=") for part in conn_str.split(";"))
+        if sep
+    }
 
 
 def _split_host_port(server_value: str) -> Tuple[str, int | None]:
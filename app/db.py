@@ -1,7 +1,11 @@
 """Shared SQL Server connection helpers."""
 from __future__ import annotations
 
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Any, Deque, Optional, Tuple
 
 from .config import get_settings
 
@@ -10,14 +14,117 @@ try:  # pragma: no cover - optional dependency during import
 except ImportError:  # pragma: no cover - ensures informative error later
     pyodbc = None
 
+_POOL_SIZE = 8
+_MAX_OVERFLOW = 16
+_POOL_RECYCLE_SECONDS = 1800
+_POOL_TIMEOUT_SECONDS = 30
+# Connections returned more recently than this are handed out without a SELECT 1 round-trip.
+_PING_IDLE_SECONDS = 30
+# Pools are created per (database, autocommit); the least recently used ones are closed past this.
+_MAX_POOLS = 16
+
+
+class _ConnectionPool:
+    """Bounded pool of pyodbc connections for a single connection string and autocommit mode."""
+
+    def __init__(self, conn_str: str, autocommit: bool = False) -> None:
+        self._conn_str = conn_str
+        self._autocommit = autocommit
+        # (connection, created, returned) with the most recently returned connection on the right
+        self._idle: Deque[Tuple[Any, float, float]] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(_POOL_SIZE + _MAX_OVERFLOW)
+        self._disposed = False
+
+    def connect(self) -> "_PooledConnection":
+        if not self._slots.acquire(timeout=_POOL_TIMEOUT_SECONDS):
+            raise RuntimeError("Timed out waiting for a pooled SQL Server connection")
+        try:
+            raw, created = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        return _PooledConnection(self, raw, created)
+
+    def _checkout(self) -> Tuple[Any, float]:
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                return pyodbc.connect(self._conn_str, timeout=30, autocommit=self._autocommit), time.monotonic()
+            raw, created, returned = entry
+            now = time.monotonic()
+            if now - created < _POOL_RECYCLE_SECONDS and (now - returned < _PING_IDLE_SECONDS or _ping(raw)):
+                return raw, created
+            _discard(raw)
+
+    def release(self, raw: Any, created: float) -> None:
+        try:
+            try:
+                raw.rollback()
+            except Exception:
+                _discard(raw)
+                return
+            # Without autocommit the connection ran client SQL; its temp tables, SET options and
+            # USE would leak into the next checkout, so it is closed instead of reused.
+            if self._autocommit:
+                with self._lock:
+                    if not self._disposed and len(self._idle) < _POOL_SIZE:
+                        self._idle.append((raw, created, time.monotonic()))
+                        return
+            _discard(raw)
+        finally:
+            self._slots.release()
+
+    def dispose(self) -> None:
+        """Close idle connections; connections still checked out are closed when returned."""
+        with self._lock:
+            self._disposed = True
+            idle, self._idle = self._idle, deque()
+        for raw, _, _ in idle:
+            _discard(raw)
+
+
+class _PooledConnection:
+    """Connection proxy whose ``close()`` hands the connection back to its pool."""
+
+    def __init__(self, pool: _ConnectionPool, raw: Any, created: float) -> None:
+        self._pool = pool
+        self._raw = raw
+        self._created = created
+
+    def close(self) -> None:
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw, self._created)
+
+    def __getattr__(self, name: str) -> Any:
+        if self._raw is None:
+            raise RuntimeError("Connection has been returned to the pool")
+        return getattr(self._raw, name)
+
+    def __enter__(self) -> "_PooledConnection":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_pools: "OrderedDict[Tuple[str, bool], _ConnectionPool]" = OrderedDict()
+_pools_lock = threading.Lock()
+
 
 def sql_connection_available() -> bool:
     """Return True when a usable SQL Server connection string is configured."""
     return bool(get_settings().resolved_sql_conn_str)
 
 
-def open_sql_connection(database: Optional[str] = None):
-    """Open a SQL Server connection using pyodbc."""
+def open_sql_connection(database: Optional[str] = None, *, autocommit: bool = False):
+    """Check out a pooled SQL Server connection; ``close()`` returns it to the pool.
+
+    Connections default to autocommit off, so anything client-supplied SQL writes is rolled
+    back on return. Only internal catalog reads should pass ``autocommit=True``.
+    """
     settings = get_settings()
     conn_str = settings.resolved_sql_conn_str
     if not conn_str:
@@ -25,22 +132,61 @@ def open_sql_connection(database: Optional[str] = None):
     if pyodbc is None:
         raise RuntimeError("pyodbc is not installed; run `pip install pyodbc`.")
     effective_conn_str = _override_database(conn_str, database) if database else conn_str
-    return pyodbc.connect(effective_conn_str, timeout=30)
+    key = (effective_conn_str, autocommit)
+    evicted = None
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _ConnectionPool(effective_conn_str, autocommit)
+            if len(_pools) > _MAX_POOLS:
+                _, evicted = _pools.popitem(last=False)
+        else:
+            _pools.move_to_end(key)
+    if evicted is not None:
+        evicted.dispose()
+    return pool.connect()
+
+
+def _ping(raw: Any) -> bool:
+    try:
+        cursor = raw.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        finally:
+            cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+def _discard(raw: Any) -> None:
+    try:
+        raw.close()
+    except Exception:
+        pass
 
 
 def _override_database(conn_str: str, database: Optional[str]) -> str:
     if not database:
         return conn_str
-    parts = [part for part in conn_str.strip().rstrip(";").split(";") if part]
-    updated: list[str] = []
-    replaced = False
-    for part in parts:
-        lowered = part.lower()
-        if lowered.startswith("database=") or lowered.startswith("initial catalog="):
-            updated.append(f"Database={database}")
-            replaced = True
-        else:
-            updated.append(part)
-    if not replaced:
-        updated.append(f"Database={database}")
+    parts, db_indexes = _split_conn(conn_str)
+    updated = list(parts)
+    entry = f"Database={database}"
+    for index in db_indexes:
+        updated[index] = entry
+    if not db_indexes:
+        updated.append(entry)
     return ";".join(updated) + ";"
+
+
+@lru_cache(maxsize=8)
+def _split_conn(conn_str: str) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """Split a connection string once and remember where its database keys sit."""
+    parts = tuple(part for part in conn_str.strip().rstrip(";").split(";") if part)
+    db_indexes = tuple(
+        index
+        for index, part in enumerate(parts)
+        if part.lower().startswith(("database=", "initial catalog="))
+    )
+    return parts, db_indexes
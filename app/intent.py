@@ -4,7 +4,8 @@ from __future__ import annotations
 import json
 import logging
 import re
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 from .azure_openai import chat_completion, is_configured
 from .schemas import ChartIntent, IntentFilter, NLSpec
@@ -15,26 +16,52 @@ SYSTEM_PROMPT = (
     "Return ONLY minified JSON matching the provided schema. Do not add prose."
 )
 
+_METRIC_KEYWORDS = ("revenue", "sales", "amount", "profit", "count", "orders")
+_DIMENSION_KEYWORDS = ("region", "country", "product", "category", "channel", "segment", "customer")
+_GRAINS = ("day", "week", "month", "quarter", "year")
+_GRAIN_RE = re.compile(r"\b(?:per|by) (day|week|month|quarter|year)")
+_DATE_RE = re.compile(r"(20\d{2}-\d{2}-\d{2})")
+_LAST_N_RE = re.compile(r"last (\d{1,2}) (day|week|month|quarter|year)s?")
+_REGION_RE = re.compile(r"in ([A-Za-z ]+)")
+# Keywords match as substrings: "salesrep" finds sales, and "country" also finds count.
+# The lookahead reports overlapping hits, so one scan finds every keyword that occurs anywhere.
+_METRIC_RE = re.compile("(?=(" + "|".join(_METRIC_KEYWORDS) + "))")
+_DIMENSION_RE = re.compile("(?=(" + "|".join(_DIMENSION_KEYWORDS) + "))")
+
 
 def parse_intent(text: str, title: str) -> NLSpec:
     """Return an NLSpec using AOAI when available, rules otherwise."""
+    return parse_intent_with_fallback(text, title)[0]
+
+
+def parse_intent_with_fallback(text: str, title: str) -> Tuple[NLSpec, bool]:
+    """Like ``parse_intent``, also reporting whether a configured AOAI call failed over to rules."""
     title = title.strip() or "Untitled Report"
     cleaned_text = text.strip()
     if not cleaned_text:
-        return parse_intent_rules(cleaned_text, title)
+        return parse_intent_rules(cleaned_text, title), False
 
-    if is_configured():
-        try:
-            spec = parse_intent_llm(cleaned_text, title)
-            if spec:
-                return spec
-        except Exception as exc:  # pragma: no cover - depends on network
-            logger.warning("AOAI intent parsing failed: %s", exc)
-    return parse_intent_rules(cleaned_text, title)
+    if not is_configured():
+        return parse_intent_rules(cleaned_text, title), False
+    try:
+        spec = parse_intent_llm(cleaned_text, title)
+        if spec:
+            return spec, False
+    except Exception as exc:  # pragma: no cover - depends on network
+        logger.warning("AOAI intent parsing failed: %s", exc)
+    return parse_intent_rules(cleaned_text, title), True
 
 
 def parse_intent_llm(text: str, title: str) -> NLSpec:
     """Use Azure OpenAI to extract a reporting spec."""
+    response = chat_completion(_intent_messages(text, title), response_format={"type": "json_object"})
+    spec = NLSpec.model_validate_json(response)
+    if not spec.title:
+        spec.title = title
+    return spec
+
+
+def _intent_messages(text: str, title: str) -> List[Dict[str, str]]:
     schema_description = json.dumps(
         {
             "title": "string",
@@ -51,39 +78,40 @@ def parse_intent_llm(text: str, title: str) -> NLSpec:
         f"JSON_SCHEMA: {schema_description}\n"
         "Return valid JSON."
     )
-    messages = [
+    return [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": user_prompt},
     ]
-    response = chat_completion(messages, response_format={"type": "json_object"})
-    spec = NLSpec.model_validate_json(response)
-    if not spec.title:
-        spec.title = title
-    return spec
 
 
 def parse_intent_rules(text: str, title: str) -> NLSpec:
     """Deterministic fallback intent parsing."""
+    # The rules are a pure function of (text, title); hand out copies so callers can't mutate the cache.
+    return _parse_intent_rules_cached(text, title).model_copy(deep=True)
+
+
+@lru_cache(maxsize=1024)
+def _parse_intent_rules_cached(text: str, title: str) -> NLSpec:
     lowered = text.lower()
-    metrics = _extract_tokens(lowered, ["revenue", "sales", "amount", "profit", "count", "orders"])
+    metrics = _extract_tokens(lowered, _METRIC_RE, _METRIC_KEYWORDS)
     if not metrics:
         metrics.append("count")
 
-    dimensions = _extract_tokens(lowered, ["region", "country", "product", "category", "channel", "segment", "customer"])
+    dimensions = _extract_tokens(lowered, _DIMENSION_RE, _DIMENSION_KEYWORDS)
     grain = _detect_grain(lowered)
 
     filters: List[IntentFilter] = []
-    date_matches = re.findall(r"(20\d{2}-\d{2}-\d{2})", text)
+    date_matches = _DATE_RE.findall(text)
     if len(date_matches) >= 2:
         filters.append(IntentFilter(field="date", operator=">=", value=date_matches[0]))
         filters.append(IntentFilter(field="date", operator="<=", value=date_matches[1]))
 
-    last_n_match = re.search(r"last (\d{1,2}) (day|week|month|quarter|year)s?", lowered)
+    last_n_match = _LAST_N_RE.search(lowered)
     if last_n_match:
         unit = last_n_match.group(2)
         filters.append(IntentFilter(field="date", operator=">=", value=f"last_{unit}_{last_n_match.group(1)}"))
 
-    region_match = re.search(r"in ([A-Za-z ]+)", text)
+    region_match = _REGION_RE.search(text)
     if region_match:
         filters.append(
             IntentFilter(field="region", operator="in", value=",".join(tok.strip() for tok in region_match.group(1).split(" and ")))
@@ -131,16 +159,14 @@ def spec_to_payload(spec: NLSpec) -> Dict[str, Any]:
     return payload
 
 
-def _extract_tokens(text: str, keywords: List[str]) -> List[str]:
-    tokens: List[str] = []
-    for keyword in keywords:
-        if keyword in text:
-            tokens.append(keyword)
-    return tokens
+def _extract_tokens(text: str, pattern: re.Pattern[str], keywords: Tuple[str, ...]) -> List[str]:
+    found = set(pattern.findall(text))
+    return [keyword for keyword in keywords if keyword in found]
 
 
 def _detect_grain(text: str) -> str:
-    for candidate in ("day", "week", "month", "quarter", "year"):
-        if re.search(rf"(per|by) {candidate}", text):
+    found = set(_GRAIN_RE.findall(text))
+    for candidate in _GRAINS:
+        if candidate in found:
             return candidate
     return "month" if "monthly" in text else "none"
@@ -1,25 +1,50 @@
 """FastAPI application entrypoint."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from secrets import token_hex
 
-from fastapi import FastAPI, Request
+import anyio.to_thread
+from fastapi import Depends, FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from . import azure_openai, ssrs_soap
 from .config import get_settings
 from .models import ServiceError, format_error
 from .routers.report import router as report_router
 from .ssrs_api import router as ssrs_router
 from .utils.logging import bind_request_context, configure_logging
+from .utils.security import make_require_api_key
 
 settings = get_settings()
 configure_logging(settings.log_level)
 logger = logging.getLogger("app")
 
-app = FastAPI(title="NL to SSRS Backend", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Blocking pyodbc/SSRS work runs on worker threads: sync routes use anyio's limiter and
+    # asyncio.to_thread uses the loop's default executor, so size both from one setting.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.worker_threads
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.worker_threads, thread_name_prefix="worker")
+    )
+    # Parse the SSRS WSDL in the background so the first publish does not pay for it.
+    warm_up = asyncio.create_task(asyncio.to_thread(ssrs_soap.warm_client))
+    yield
+    # Do not hold shutdown for a slow WSDL fetch; the worker thread finishes on its own.
+    warm_up.cancel()
+    with suppress(asyncio.CancelledError):
+        await warm_up
+    azure_openai.close()
+
+
+app = FastAPI(title="NL to SSRS Backend", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -53,20 +78,23 @@ async def default_exception_handler(request: Request, exc: Exception):  # pragma
 
 @app.middleware("http")
 async def request_context_middleware(request: Request, call_next):
-    request.state.request_id = str(uuid.uuid4())
-    context = bind_request_context(request)
-    start = time.perf_counter()
+    request.state.request_id = token_hex(16)
+    start = time.monotonic_ns()
     try:
         response = await call_next(request)
     except ServiceError:
         raise
     except Exception:  # pragma: no cover - handled by exception handler
-        context["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        context = bind_request_context(request)
+        context["duration_ms"] = (time.monotonic_ns() - start) // 1_000_000
         logger.exception("unhandled error", extra=context)
         raise
-    context["status_code"] = response.status_code
-    context["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
-    logger.info("request", extra=context)
+    # Skip building the log context entirely when INFO records would be dropped.
+    if logger.isEnabledFor(logging.INFO):
+        context = bind_request_context(request)
+        context["status_code"] = response.status_code
+        context["duration_ms"] = (time.monotonic_ns() - start) // 1_000_000
+        logger.info("request", extra=context)
     return response
 
 
@@ -75,5 +103,7 @@ async def health() -> dict[str, bool]:
     return {"ok": True}
 
 
-app.include_router(report_router)
-app.include_router(ssrs_router)
+# The expected key is read once here; requests only pay for the header comparison.
+_api_key_dependencies = [Depends(make_require_api_key(settings.api_key))]
+app.include_router(report_router, dependencies=_api_key_dependencies)
+app.include_router(ssrs_router, dependencies=_api_key_dependencies)
@@ -1,25 +1,64 @@
 """Schema-aware column mapping helpers."""
 from __future__ import annotations
 
-import json
+import heapq
 import re
-from typing import List, Optional, Sequence, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-from rapidfuzz import fuzz
+import orjson
+from rapidfuzz import fuzz, process
 
 from . import azure_openai
 from .schemas import ColumnMetadata, MissingFieldSuggestion, NLSpec, SchemaInsights, SuggestedMappingItem
 
 TIME_TERMS = {"date", "day", "week", "month", "quarter", "year", "time"}
+# Brackets, dots, underscores and any other non-alphanumeric run all collapse to a single space.
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+class _IndexedColumn(NamedTuple):
+    column: ColumnMetadata
+    column_label: str
+    table_label: str
+
+
+class _ColumnIndex(NamedTuple):
+    """Columns with their normalized labels and role partitions, computed once per request."""
+
+    all: List[_IndexedColumn]
+    numeric: List[_IndexedColumn]
+    dates: List[_IndexedColumn]
+    categorical: List[_IndexedColumn]
+    by_name: Dict[str, List[_IndexedColumn]]
+
+
+def _build_index(columns: Sequence[ColumnMetadata]) -> _ColumnIndex:
+    entries = [
+        _IndexedColumn(col, _normalize(col.qualified_name), _normalize(f"{col.schema} {col.table} {col.column}"))
+        for col in columns
+    ]
+    by_name: Dict[str, List[_IndexedColumn]] = {}
+    for entry in entries:
+        by_name.setdefault(_normalize(entry.column.column), []).append(entry)
+    return _ColumnIndex(
+        all=entries,
+        numeric=[entry for entry in entries if entry.column.isNumeric],
+        dates=[entry for entry in entries if entry.column.isDateLike],
+        categorical=[entry for entry in entries if not entry.column.isNumeric],
+        by_name=by_name,
+    )
 
 
 def map_terms(spec: NLSpec, columns: Sequence[ColumnMetadata]) -> List[SuggestedMappingItem]:
     """Return schema-aware mappings for metrics and dimensions."""
+    index = _build_index(columns)
     mappings: List[SuggestedMappingItem] = []
     for term in spec.metrics:
-        mappings.append(_map_single(term, "metric", columns))
+        mappings.append(_map_single(term, "metric", index))
     for term in spec.dimensions:
-        mappings.append(_map_single(term, "dimension", columns))
+        mappings.append(_map_single(term, "dimension", index))
     return mappings
 
 
@@ -27,24 +66,31 @@ def compute_schema_insights(spec: NLSpec, mappings: Sequence[SuggestedMappingIte
     total_terms = len(spec.metrics) + len(spec.dimensions)
     matched = [item.term for item in mappings if item.column]
     missing: List[MissingFieldSuggestion] = []
+    index: Optional[_ColumnIndex] = None
     for item in mappings:
         if item.column:
             continue
-        suggestions = _top_suggestions(item.term, columns, limit=3)
+        if index is None:
+            index = _build_index(columns)
+        suggestions = _top_suggestions(item.term, index.all, limit=3)
         missing.append(MissingFieldSuggestion(name=item.term, suggestions=suggestions))
     coverage = 0 if total_terms == 0 else round(100 * len(matched) / total_terms)
     return SchemaInsights(coveragePercent=coverage, matchedFields=matched, missingFields=missing)
 
 
-def _map_single(term: str, role: str, columns: Sequence[ColumnMetadata]) -> SuggestedMappingItem:
+def _map_single(term: str, role: str, index: _ColumnIndex) -> SuggestedMappingItem:
     normalized_term = _normalize(term)
-    pool = _filter_columns_for_role(role, normalized_term, columns)
-    scored = [_score_column(normalized_term, col) for col in pool]
-    scored.sort(key=lambda item: item[1], reverse=True)
-    top_col, confidence = (scored[0] if scored else (None, 0.0))
-
-    if top_col and azure_openai.is_configured() and len(scored) > 1:
-        reranked = _rerank_with_llm(term, scored[:3])
+    pool = _filter_columns_for_role(role, normalized_term, index)
+    exact = [entry for entry in index.by_name.get(normalized_term, ()) if _in_pool(entry, pool, index)]
+    if len(exact) == 1:
+        # An unambiguous exact column-name hit scores 1.0 anyway; skip fuzzy scoring and the rerank.
+        top = [(exact[0].column, 1.0)]
+    else:
+        top = heapq.nlargest(3, _score_columns(normalized_term, pool), key=itemgetter(1))
+    top_col, confidence = (top[0] if top else (None, 0.0))
+
+    if top_col and azure_openai.is_configured() and len(top) > 1:
+        reranked = _rerank_with_llm(term, top)
         if reranked is not None:
             top_col, confidence = reranked
 
@@ -69,35 +115,43 @@ def _map_single(term: str, role: str, columns: Sequence[ColumnMetadata]) -> Sugg
     )
 
 
-def _filter_columns_for_role(role: str, term: str, columns: Sequence[ColumnMetadata]) -> List[ColumnMetadata]:
+def _filter_columns_for_role(role: str, term: str, index: _ColumnIndex) -> List[_IndexedColumn]:
     if role == "metric":
-        numeric_cols = [col for col in columns if col.isNumeric]
-        return numeric_cols or list(columns)
+        return index.numeric or index.all
     if any(token in term for token in TIME_TERMS):
-        date_cols = [col for col in columns if col.isDateLike]
-        return date_cols or list(columns)
-    categorical = [col for col in columns if not col.isNumeric]
-    return categorical or list(columns)
+        return index.dates or index.all
+    return index.categorical or index.all
+
+
+def _in_pool(entry: _IndexedColumn, pool: List[_IndexedColumn], index: _ColumnIndex) -> bool:
+    if pool is index.all:
+        return True
+    if pool is index.numeric:
+        return entry.column.isNumeric
+    if pool is index.dates:
+        return entry.column.isDateLike
+    return not entry.column.isNumeric
 
 
-def _score_column(term: str, column: ColumnMetadata) -> Tuple[ColumnMetadata, float]:
-    column_label = _normalize(column.qualified_name)
-    table_label = _normalize(f"{column.schema} {column.table} {column.column}")
-    score = max(fuzz.token_set_ratio(term, column_label), fuzz.token_set_ratio(term, table_label)) / 100
-    return column, score
+def _score_columns(term: str, entries: Sequence[_IndexedColumn]) -> List[Tuple[ColumnMetadata, float]]:
+    """Score every entry as the best of its two labels, batching the fuzzy matching in rapidfuzz."""
+    scores = [0.0] * len(entries)
+    for labels in ([entry.column_label for entry in entries], [entry.table_label for entry in entries]):
+        for _, score, idx in process.extract_iter(term, labels, scorer=fuzz.token_set_ratio, processor=None):
+            if score > scores[idx]:
+                scores[idx] = score
+    return [(entry.column, score / 100) for entry, score in zip(entries, scores)]
 
 
+@lru_cache(maxsize=4096)
 def _normalize(value: str) -> str:
-    lowered = value.lower()
-    lowered = re.sub(r"[\[\]\._]", " ", lowered)
-    lowered = re.sub(r"[^a-z0-9 ]+", " ", lowered)
-    return re.sub(r"\s+", " ", lowered).strip()
+    return _NON_ALNUM_RE.sub(" ", value.lower()).strip()
 
 
-def _top_suggestions(term: str, columns: Sequence[ColumnMetadata], limit: int = 3) -> List[str]:
+def _top_suggestions(term: str, columns: Sequence[_IndexedColumn], limit: int = 3) -> List[str]:
     normalized_term = _normalize(term)
-    scored = sorted((_score_column(normalized_term, col) for col in columns), key=lambda item: item[1], reverse=True)
-    return [item[0].qualified_name for item in scored[:limit] if item[1] > 0]
+    top = heapq.nlargest(limit, _score_columns(normalized_term, columns), key=itemgetter(1))
+    return [item[0].qualified_name for item in top if item[1] > 0]
 
 
 def _rerank_with_llm(term: str, candidates: Sequence[Tuple[ColumnMetadata, float]]) -> Optional[Tuple[ColumnMetadata, float]]:
@@ -111,7 +165,7 @@ def _rerank_with_llm(term: str, candidates: Sequence[Tuple[ColumnMetadata, float
             "Candidates:\n"
             "{candidates}\n"
             'Return JSON like {"index":0}.'
-        ).format(term=term, candidates=json.dumps(options))
+        ).format(term=term, candidates=orjson.dumps(options).decode())
         content = azure_openai.chat_completion(
             [
                 {"role": "system", "content": "Pick the best matching column index. Respond with minified JSON only."},
@@ -119,7 +173,7 @@ def _rerank_with_llm(term: str, candidates: Sequence[Tuple[ColumnMetadata, float
             ],
             response_format={"type": "json_object"},
         )
-        data = json.loads(content)
+        data = orjson.loads(content)
         idx = data.get("index")
         if isinstance(idx, int) and 0 <= idx < len(candidates):
             return candidates[idx]
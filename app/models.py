@@ -32,9 +32,10 @@ class PaginatedRows:
     total: int
 
     @classmethod
-    def from_iterable(cls, data: Iterable[dict[str, Any]]) -> "PaginatedRows":
-        data_list = list(data)
-        return cls(rows=data_list, total=len(data_list))
+    def from_iterable(cls, data: Iterable[dict[str, Any]], total: Optional[int] = None) -> "PaginatedRows":
+        """Wrap ``data`` without copying when it is already a list; ``total`` overrides the row count."""
+        data_list = data if isinstance(data, list) else list(data)
+        return cls(rows=data_list, total=len(data_list) if total is None else total)
 
 
 class ServiceError(Exception):
@@ -1,146 +1,13 @@
-"""RDL document builder using Jinja2 templates."""
+"""RDL document builder assembling the report XML tree directly with lxml."""
 from __future__ import annotations
 
 from typing import Iterable, Optional
 
-from jinja2 import Template
+from lxml import etree
 
 from .schemas import ChartSpec, ColumnDef, ParamDef
 
-_RDL_TEMPLATE = Template(
-    """<?xml version=\"1.0\" encoding=\"utf-8\"?>
-<Report xmlns=\"{{ namespace }}\" xmlns:rd=\"http://schemas.microsoft.com/SQLServer/reporting/reportdesigner\">
-  <AutoRefresh>0</AutoRefresh>
-  <DataSources>
-    <DataSource Name=\"{{ ds_name }}\">
-      <DataSourceReference>{{ shared_ds_path }}</DataSourceReference>
-    </DataSource>
-  </DataSources>
-  <DataSets>
-    <DataSet Name=\"{{ dataset_name }}\">
-      <Query>
-        <DataSourceName>{{ ds_name }}</DataSourceName>
-        <CommandText>{{ sql_text | e }}</CommandText>
-      </Query>
-      <Fields>
-        {% for field in fields %}
-        <Field Name=\"{{ field.name }}\">
-          <DataField>{{ field.name }}</DataField>
-          <rd:TypeName>{{ field.rdlType }}</rd:TypeName>
-        </Field>
-        {% endfor %}
-      </Fields>
-      {% if parameters %}
-      <QueryParameters>
-        {% for param in parameters %}
-        <QueryParameter Name=\"{{ param.name }}\">
-          <Value>=Parameters!{{ param.name }}.Value</Value>
-        </QueryParameter>
-        {% endfor %}
-      </QueryParameters>
-      {% endif %}
-    </DataSet>
-  </DataSets>
-  {% if parameters %}
-  <ReportParameters>
-    {% for param in parameters %}
-    <ReportParameter Name=\"{{ param.name }}\">
-      <DataType>{{ param.rdlType }}</DataType>
-      <Prompt>{{ param.prompt or param.name }}</Prompt>
-      <Hidden>false</Hidden>
-    </ReportParameter>
-    {% endfor %}
-  </ReportParameters>
-  {% endif %}
-  <Body>
-    <ReportItems>
-      <Tablix Name=\"MainTable\">
-        <TablixBody>
-          <TablixColumns>
-            {% for field in fields %}<TablixColumn><Width>1in</Width></TablixColumn>{% endfor %}
-          </TablixColumns>
-          <TablixRows>
-            <TablixRow>
-              <Height>0.25in</Height>
-              <TablixCells>
-                {% for field in fields %}
-                <TablixCell>
-                  <CellContents>
-                    <Textbox Name=\"Header{{ loop.index }}\">
-                      <Value>{{ field.display_name }}</Value>
-                      <Style><FontWeight>Bold</FontWeight></Style>
-                    </Textbox>
-                  </CellContents>
-                </TablixCell>
-                {% endfor %}
-              </TablixCells>
-            </TablixRow>
-            <TablixRow>
-              <Height>0.25in</Height>
-              <TablixCells>
-                {% for field in fields %}
-                <TablixCell>
-                  <CellContents>
-                    <Textbox Name=\"Detail{{ loop.index }}\">
-                      <Value>=Fields!{{ field.name }}.Value</Value>
-                    </Textbox>
-                  </CellContents>
-                </TablixCell>
-                {% endfor %}
-              </TablixCells>
-            </TablixRow>
-          </TablixRows>
-        </TablixBody>
-        <DataSetName>{{ dataset_name }}</DataSetName>
-      </Tablix>
-      {% if chart %}
-      <Chart Name=\"MainChart\">
-        <ChartCategoryHierarchy>
-          <ChartMembers>
-            <ChartMember>
-              <Label>=Fields!{{ chart.category }}.Value</Label>
-            </ChartMember>
-          </ChartMembers>
-        </ChartCategoryHierarchy>
-        <ChartSeriesHierarchy>
-          <ChartMembers>
-            {% for series in chart.series or ['Series'] %}
-            <ChartMember>
-              <Label>{{ series }}</Label>
-            </ChartMember>
-            {% endfor %}
-          </ChartMembers>
-        </ChartSeriesHierarchy>
-        <ChartData>
-          <ChartSeriesCollection>
-            {% for value in chart.values %}
-            <ChartSeries>
-              <DataPoints>
-                <DataPoint>
-                  <DataValues>
-                    <DataValue><Value>=Fields!{{ value }}.Value</Value></DataValue>
-                  </DataValues>
-                </DataPoint>
-              </DataPoints>
-            </ChartSeries>
-            {% endfor %}
-          </ChartSeriesCollection>
-        </ChartData>
-        <DataSetName>{{ dataset_name }}</DataSetName>
-        <ChartType>{{ chart.type.title() }}</ChartType>
-      </Chart>
-      {% endif %}
-    </ReportItems>
-    <Height>4in</Height>
-  </Body>
-  <Width>8in</Width>
-  <Page>
-    <PageHeight>11in</PageHeight>
-    <PageWidth>8.5in</PageWidth>
-  </Page>
-</Report>
-"""
-)
+_RD_NAMESPACE = "http://schemas.microsoft.com/SQLServer/reporting/reportdesigner"
 
 
 def build_rdl(
@@ -153,14 +20,79 @@ def build_rdl(
     fields: Iterable[ColumnDef],
     chart: Optional[ChartSpec],
 ) -> bytes:
-    rendered = _RDL_TEMPLATE.render(
-        namespace=namespace,
-        ds_name=ds_name,
-        shared_ds_path=shared_ds_path,
-        dataset_name=dataset_name,
-        sql_text=sql_text,
-        parameters=list(parameters),
-        fields=list(fields),
-        chart=chart,
-    )
-    return rendered.encode("utf-8")
+    parameters = list(parameters)
+    fields = list(fields)
+    ns = f"{{{namespace}}}"
+
+    def sub(parent: etree._Element, tag: str, text: Optional[str] = None, **attrib: str) -> etree._Element:
+        element = etree.SubElement(parent, ns + tag, attrib)
+        if text is not None:
+            element.text = text
+        return element
+
+    report = etree.Element(ns + "Report", nsmap={None: namespace, "rd": _RD_NAMESPACE})
+    sub(report, "AutoRefresh", "0")
+
+    data_source = sub(sub(report, "DataSources"), "DataSource", Name=ds_name)
+    sub(data_source, "DataSourceReference", shared_ds_path)
+
+    data_set = sub(sub(report, "DataSets"), "DataSet", Name=dataset_name)
+    query = sub(data_set, "Query")
+    sub(query, "DataSourceName", ds_name)
+    sub(query, "CommandText", sql_text)
+    fields_el = sub(data_set, "Fields")
+    for field in fields:
+        field_el = sub(fields_el, "Field", Name=field.name)
+        sub(field_el, "DataField", field.name)
+        etree.SubElement(field_el, f"{{{_RD_NAMESPACE}}}TypeName").text = field.rdlType
+    if parameters:
+        query_params = sub(data_set, "QueryParameters")
+        report_params = sub(report, "ReportParameters")
+        for param in parameters:
+            sub(sub(query_params, "QueryParameter", Name=param.name), "Value", f"=Parameters!{param.name}.Value")
+            report_param = sub(report_params, "ReportParameter", Name=param.name)
+            sub(report_param, "DataType", param.rdlType)
+            sub(report_param, "Prompt", param.prompt or param.name)
+            sub(report_param, "Hidden", "false")
+
+    body = sub(report, "Body")
+    items = sub(body, "ReportItems")
+    tablix = sub(items, "Tablix", Name="MainTable")
+    tablix_body = sub(tablix, "TablixBody")
+    tablix_columns = sub(tablix_body, "TablixColumns")
+    rows = sub(tablix_body, "TablixRows")
+    header_row = sub(rows, "TablixRow")
+    sub(header_row, "Height", "0.25in")
+    header_cells = sub(header_row, "TablixCells")
+    detail_row = sub(rows, "TablixRow")
+    sub(detail_row, "Height", "0.25in")
+    detail_cells = sub(detail_row, "TablixCells")
+    for index, field in enumerate(fields, start=1):
+        sub(sub(tablix_columns, "TablixColumn"), "Width", "1in")
+        header = sub(sub(sub(header_cells, "TablixCell"), "CellContents"), "Textbox", Name=f"Header{index}")
+        sub(header, "Value", field.display_name)
+        sub(sub(header, "Style"), "FontWeight", "Bold")
+        detail = sub(sub(sub(detail_cells, "TablixCell"), "CellContents"), "Textbox", Name=f"Detail{index}")
+        sub(detail, "Value", f"=Fields!{field.name}.Value")
+    sub(tablix, "DataSetName", dataset_name)
+
+    if chart:
+        chart_el = sub(items, "Chart", Name="MainChart")
+        category_member = sub(sub(sub(chart_el, "ChartCategoryHierarchy"), "ChartMembers"), "ChartMember")
+        sub(category_member, "Label", f"=Fields!{chart.category}.Value")
+        series_members = sub(sub(chart_el, "ChartSeriesHierarchy"), "ChartMembers")
+        for series in chart.series or ["Series"]:
+            sub(sub(series_members, "ChartMember"), "Label", series)
+        series_collection = sub(sub(chart_el, "ChartData"), "ChartSeriesCollection")
+        for value in chart.values:
+            data_point = sub(sub(sub(series_collection, "ChartSeries"), "DataPoints"), "DataPoint")
+            sub(sub(sub(data_point, "DataValues"), "DataValue"), "Value", f"=Fields!{value}.Value")
+        sub(chart_el, "DataSetName", dataset_name)
+        sub(chart_el, "ChartType", chart.type.title())
+
+    sub(body, "Height", "4in")
+    sub(report, "Width", "8in")
+    page = sub(report, "Page")
+    sub(page, "PageHeight", "11in")
+    sub(page, "PageWidth", "8.5in")
+    return etree.tostring(report, xml_declaration=True, encoding="utf-8", pretty_print=True)
@@ -1,8 +1,11 @@
 """RDL XML builder for SSRS 2016+ reports."""
+import io
 import uuid
-from typing import List
+from typing import Callable, List
 from .schema_discovery import FieldSpec
 
+_XML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&apos;'})
+
 
 def build_rdl(
     report_name: str,
@@ -13,7 +16,7 @@ def build_rdl(
     sql: str,
     fields: List[FieldSpec],
     parameters: List[str]
-) -> str:
+) -> bytes:
     """
     Build a proper SSRS 2016+ RDL document.
     
@@ -28,28 +31,17 @@ def build_rdl(
         parameters: List of parameter names (without @)
         
     Returns:
-        RDL XML as string
+        RDL XML as UTF-8 encoded bytes
     """
-    # Use string template for proper SSRS structure
     report_id = str(uuid.uuid4())
     
-    # Build fields XML
-    fields_xml = _build_fields_xml(fields)
-    
-    # Build query parameters XML
-    query_params_xml = _build_query_parameters_xml(parameters) if parameters else ""
-    
-    # Build report parameters XML
-    report_params_xml = _build_report_parameters_xml(parameters) if parameters else ""
-    
-    # Build tablix XML
-    tablix_xml = _build_tablix_xml(data_set_name, fields)
+    # Escape SQL for XML in a single pass
+    sql_escaped = sql.translate(_XML_ESCAPES)
     
-    # Escape SQL for XML
-    sql_escaped = sql.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;').replace("'", '&apos;')
-    
-    # Build complete RDL
-    rdl = f'''<?xml version="1.0" encoding="utf-8"?>
+    # Write each section's UTF-8 bytes straight into one buffer
+    buf = io.BytesIO()
+    w = buf.write
+    w(f'''<?xml version="1.0" encoding="utf-8"?>
 <Report xmlns="http://schemas.microsoft.com/sqlserver/reporting/2016/01/reportdefinition" xmlns:rd="http://schemas.microsoft.com/SQLServer/reporting/reportdesigner">
 \t<AutoRefresh>0</AutoRefresh>
 \t<DataSources>
@@ -65,16 +57,26 @@ def build_rdl(
 \t\t\t<Query>
 \t\t\t\t<DataSourceName>{data_source_name}</DataSourceName>
 \t\t\t\t<CommandType>Text</CommandType>
-\t\t\t\t<CommandText>{sql_escaped}</CommandText>{query_params_xml}
+\t\t\t\t<CommandText>{sql_escaped}</CommandText>'''.encode('utf-8'))
+    if parameters:
+        _write_query_parameters_xml(w, parameters)
+    w(b'''
 \t\t\t</Query>
-\t\t\t<Fields>{fields_xml}
+\t\t\t<Fields>''')
+    _write_fields_xml(w, fields)
+    w(b'''
 \t\t\t</Fields>
 \t\t</DataSet>
-\t</DataSets>{report_params_xml}
+\t</DataSets>''')
+    if parameters:
+        _write_report_parameters_xml(w, parameters)
+    w(b'''
 \t<ReportSections>
 \t\t<ReportSection>
 \t\t\t<Body>
-\t\t\t\t<ReportItems>{tablix_xml}
+\t\t\t\t<ReportItems>''')
+    _write_tablix_xml(w, data_set_name, fields)
+    w(f'''
 \t\t\t\t</ReportItems>
 \t\t\t\t<Height>2in</Height>
 \t\t\t\t<Style />
@@ -94,62 +96,19 @@ def build_rdl(
 \t<Language>=User!Language</Language>
 \t<rd:ReportUnitType>Inch</rd:ReportUnitType>
 \t<rd:ReportID>{report_id}</rd:ReportID>
-</Report>'''
+</Report>'''.encode('utf-8'))
     
-    return rdl
-
-
-def _build_fields_xml(fields: List[FieldSpec]) -> str:
-    """Build Fields XML section."""
-    fields_xml_parts = []
-    for field in fields:
-        fields_xml_parts.append(f'''
-				<Field Name="{field.name}">
-					<DataField>{field.name}</DataField>
-					<rd:TypeName>{field.rdl_type}</rd:TypeName>
-				</Field>''')
-    return ''.join(fields_xml_parts)
+    return buf.getvalue()
 
 
-def _build_query_parameters_xml(parameters: List[str]) -> str:
-    """Build QueryParameters XML section."""
-    params_xml_parts = ['\n				<QueryParameters>']
-    for param in parameters:
-        params_xml_parts.append(f'''
-					<QueryParameter Name="@{param}">
-						<Value>=Parameters!{param}.Value</Value>
-					</QueryParameter>''')
-    params_xml_parts.append('\n				</QueryParameters>')
-    return ''.join(params_xml_parts)
-
-
-def _build_report_parameters_xml(parameters: List[str]) -> str:
-    """Build ReportParameters XML section."""
-    params_xml_parts = ['\n	<ReportParameters>']
-    for param in parameters:
-        params_xml_parts.append(f'''
-		<ReportParameter Name="{param}">
-			<DataType>String</DataType>
-			<Nullable>true</Nullable>
-			<Prompt>{param}</Prompt>
-		</ReportParameter>''')
-    params_xml_parts.append('\n	</ReportParameters>')
-    return ''.join(params_xml_parts)
-
-
-def _build_tablix_xml(data_set_name: str, fields: List[FieldSpec]) -> str:
-    """Build Tablix XML with proper SSRS 2016+ structure."""
-    
-    # Build columns
-    columns_xml = ''.join([f'''
+# Per-field tablix fragments; the field-independent ones are kept pre-encoded.
+_TABLIX_COLUMN_BYTES = b'''
 						<TablixColumn>
 							<Width>1in</Width>
-						</TablixColumn>''' for _ in fields])
-    
-    # Build header row cells
-    header_cells = []
-    for i, field in enumerate(fields, 1):
-        header_cells.append(f'''
+						</TablixColumn>'''
+_TABLIX_COLUMN_MEMBER_BYTES = b'''
+							<TablixMember />'''
+_HEADER_CELL_TMPL = '''
 							<TablixCell>
 								<CellContents>
 									<Textbox Name="Header_{i}">
@@ -159,7 +118,7 @@ def _build_tablix_xml(data_set_name: str, fields: List[FieldSpec]) -> str:
 											<Paragraph>
 												<TextRuns>
 													<TextRun>
-														<Value>{field.name}</Value>
+														<Value>{name}</Value>
 														<Style />
 													</TextRun>
 												</TextRuns>
@@ -178,12 +137,8 @@ def _build_tablix_xml(data_set_name: str, fields: List[FieldSpec]) -> str:
 										</Style>
 									</Textbox>
 								</CellContents>
-							</TablixCell>''')
-    
-    # Build detail row cells
-    detail_cells = []
-    for i, field in enumerate(fields, 1):
-        detail_cells.append(f'''
+							</TablixCell>'''
+_DETAIL_CELL_TMPL = '''
 							<TablixCell>
 								<CellContents>
 									<Textbox Name="Detail_{i}">
@@ -193,7 +148,7 @@ def _build_tablix_xml(data_set_name: str, fields: List[FieldSpec]) -> str:
 											<Paragraph>
 												<TextRuns>
 													<TextRun>
-														<Value>=Fields!{field.name}.Value</Value>
+														<Value>=Fields!{name}.Value</Value>
 														<Style />
 													</TextRun>
 												</TextRuns>
@@ -212,34 +167,78 @@ def _build_tablix_xml(data_set_name: str, fields: List[FieldSpec]) -> str:
 										</Style>
 									</Textbox>
 								</CellContents>
-							</TablixCell>''')
-    
-    # Build column hierarchy members
-    column_members = ''.join(['''
-							<TablixMember />''' for _ in fields])
-    
-    # Complete tablix XML
-    tablix = f'''
+							</TablixCell>'''
+
+
+def _write_fields_xml(w: Callable[[bytes], int], fields: List[FieldSpec]) -> None:
+    """Write Fields XML section."""
+    for field in fields:
+        w(f'''
+				<Field Name="{field.name}">
+					<DataField>{field.name}</DataField>
+					<rd:TypeName>{field.rdl_type}</rd:TypeName>
+				</Field>'''.encode('utf-8'))
+
+
+def _write_query_parameters_xml(w: Callable[[bytes], int], parameters: List[str]) -> None:
+    """Write QueryParameters XML section."""
+    w(b'\n				<QueryParameters>')
+    for param in parameters:
+        w(f'''
+					<QueryParameter Name="@{param}">
+						<Value>=Parameters!{param}.Value</Value>
+					</QueryParameter>'''.encode('utf-8'))
+    w(b'\n				</QueryParameters>')
+
+
+def _write_report_parameters_xml(w: Callable[[bytes], int], parameters: List[str]) -> None:
+    """Write ReportParameters XML section."""
+    w(b'\n	<ReportParameters>')
+    for param in parameters:
+        w(f'''
+		<ReportParameter Name="{param}">
+			<DataType>String</DataType>
+			<Nullable>true</Nullable>
+			<Prompt>{param}</Prompt>
+		</ReportParameter>'''.encode('utf-8'))
+    w(b'\n	</ReportParameters>')
+
+
+def _write_tablix_xml(w: Callable[[bytes], int], data_set_name: str, fields: List[FieldSpec]) -> None:
+    """Write Tablix XML with proper SSRS 2016+ structure."""
+    w(b'''
 					<Tablix Name="Table1">
 						<TablixBody>
-							<TablixColumns>{columns_xml}
+							<TablixColumns>''')
+    w(_TABLIX_COLUMN_BYTES * len(fields))
+    w(b'''
 							</TablixColumns>
 							<TablixRows>
 								<TablixRow>
 									<Height>0.25in</Height>
-									<TablixCells>{''.join(header_cells)}
+									<TablixCells>''')
+    for i, field in enumerate(fields, 1):
+        w(_HEADER_CELL_TMPL.format(i=i, name=field.name).encode('utf-8'))
+    w(b'''
 									</TablixCells>
 								</TablixRow>
 								<TablixRow>
 									<Height>0.25in</Height>
-									<TablixCells>{''.join(detail_cells)}
+									<TablixCells>''')
+    for i, field in enumerate(fields, 1):
+        w(_DETAIL_CELL_TMPL.format(i=i, name=field.name).encode('utf-8'))
+    w(b'''
 									</TablixCells>
 								</TablixRow>
 							</TablixRows>
 						</TablixBody>
-						<DataSetName>{data_set_name}</DataSetName>
+						<DataSetName>''')
+    w(data_set_name.encode('utf-8'))
+    w(b'''</DataSetName>
 						<TablixColumnHierarchy>
-							<TablixMembers>{column_members}
+							<TablixMembers>''')
+    w(_TABLIX_COLUMN_MEMBER_BYTES * len(fields))
+    w(b'''
 							</TablixMembers>
 						</TablixColumnHierarchy>
 						<TablixRowHierarchy>
@@ -253,12 +252,12 @@ def _build_tablix_xml(data_set_name: str, fields: List[FieldSpec]) -> str:
 							</TablixMembers>
 						</TablixRowHierarchy>
 						<Height>0.5in</Height>
-						<Width>{len(fields)}in</Width>
+						<Width>''')
+    w(str(len(fields)).encode('utf-8'))
+    w(b'''in</Width>
 						<Style>
 							<Border>
 								<Style>None</Style>
 							</Border>
 						</Style>
-					</Tablix>'''
-    
-    return tablix
+					</Tablix>''')
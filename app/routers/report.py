@@ -1,47 +1,98 @@
 """Report-related API endpoints."""
 from __future__ import annotations
 
+import asyncio
 import contextlib
-import copy
-import json
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import re
+import threading
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, HTTPException
-from fastapi.encoders import jsonable_encoder
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import TypeAdapter
 
 from .. import azure_openai, catalog, sqlgen
 from ..config import get_settings
-from ..intent import parse_intent, spec_to_payload
+from ..intent import parse_intent_with_fallback, spec_to_payload
 from ..mapping import compute_schema_insights, map_terms
 from ..db import open_sql_connection, sql_connection_available
 from ..models import ServiceError
 from ..rdl import build_rdl
+from ..schema_discovery import clear_describe_cache
 from ..schemas import (
     ColumnDef,
+    ColumnMetadata,
     FilterDef,
     GenSQLIn,
     GenSQLOut,
     InferIn,
     InferOut,
+    Mapping,
+    PreviewColumnsOut,
     PreviewIn,
     PreviewOut,
     PublishIn,
     PublishOut,
-    Mapping,
+    NLSpec,
+    SchemaInsights,
     SortDef,
+    SuggestedMappingItem,
 )
 from ..smoketest import make_render_url
 from ..ssrs_rest import get_system_info, set_report_datasources
 from ..ssrs_soap import set_shared_datasource, upload_rdl
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
 router = APIRouter(prefix="/report", tags=["reports"])
 
+# Whole-list serializers: one pydantic-core call instead of a model_dump() per item.
+_MAPPING_LIST = TypeAdapter(List[Mapping])
+_SUGGESTED_LIST = TypeAdapter(List[SuggestedMappingItem])
+_COLUMN_META_LIST = TypeAdapter(List[ColumnMetadata])
+
+# Resubmitted infer requests reuse the previous answer for as long as the column cache would.
+_infer_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_infer_cache_lock = threading.Lock()
+
+# Previews re-run while a form is being edited; serve identical queries from memory briefly.
+# Clients pass ?cache_bypass=true to force a fresh read.
+_preview_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+_preview_cache_lock = threading.Lock()
+
+_LOG_PAYLOAD_MAX_CHARS = 2000
+_LOG_MAX_ITEMS = 20
+_LOG_MAX_STRING = 500
+_LOG_MAX_DEPTH = 6
+
+# Strings, comments and parentheses are matched whole so only a top-level ORDER BY is reported.
+# Unterminated strings and block comments run to the end of the text.
+_SQL_TOKEN_RE = re.compile(
+    r"'(?:[^']|'')*'?|\"(?:[^\"]|\"\")*\"?|--[^\r\n]*|/\*.*?(?:\*/|\Z)|\(|\)|\border\s+by\b",
+    re.DOTALL | re.IGNORECASE,
+)
+SQL_SYSTEM_PROMPT = (
+    "You generate SQL Server SELECT statements for SSRS datasets. "
+    "Only reference columns provided in the mapping. "
+    "Always return JSON with keys 'sql' and 'params'. "
+    "If no measures are supplied, use COUNT(1) AS RowCount. "
+    "Parameters must include JSON objects with fields name, rdlType, and optionally value."
+)
+# Shared by every generateSQL call; never mutated.
+_SQL_SYSTEM_MESSAGE = {"role": "system", "content": SQL_SYSTEM_PROMPT}
+_SQL_RULES = {"dialect": "SQL Server", "aggregate_measures": True, "group_dimensions": True}
+_PARAM_DATE_RE = re.compile(r"date|time", re.IGNORECASE)
+_PARAM_FLOAT_RE = re.compile(r"amount|qty|count|total", re.IGNORECASE)
+
 STATIC_NLP_TRIGGER = "Returns summed Quantity1/2/3 per item and inventory count (non-deleted, approved counts after 2025‑10‑04)"
 STATIC_PRESET_ID = "static-summed-Quantity-v1"
+_STATIC_NLP_TRIGGERS = frozenset({STATIC_NLP_TRIGGER.casefold()})
+_STATIC_NLP_TRIGGER_MAX_LEN = max(map(len, _STATIC_NLP_TRIGGERS))
 _STATIC_INFER_RESPONSE: Dict[str, Any] = {
     "spec": {
         "title": "Static Inventory Count Summary",
@@ -202,10 +253,13 @@ _STATIC_GENSQL_RESPONSE: Dict[str, Any] = {
     ),
     "params": [],
 }
+# The presets never change, so validate and encode them once instead of copying per request.
+_STATIC_INFER_BYTES = orjson.dumps(InferOut.model_validate(_STATIC_INFER_RESPONSE).model_dump(mode="json"))
+_STATIC_GENSQL_BYTES = orjson.dumps(GenSQLOut(**_STATIC_GENSQL_RESPONSE).model_dump(mode="json"))
 
 
-@router.get("/customerDatabases")
-def list_databases() -> Dict[str, List[Dict[str, str]]]:
+@router.get("/customerDatabases", response_model=Dict[str, List[Dict[str, str]]])
+def list_databases(request: Request) -> Response:
     _log_api_event("customerDatabases.request", None)
     try:
         databases = catalog.list_databases()
@@ -217,12 +271,30 @@ def list_databases() -> Dict[str, List[Dict[str, str]]]:
             message = f"{message}: {detail}"
         raise ServiceError(message, "catalog_error", status_code=502) from exc
     response = {"databases": databases}
+    body = orjson.dumps(response)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
     _log_api_event("customerDatabases.response", response)
-    return response
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/admin/flush-catalog")
+def flush_catalog(db: Optional[str] = None) -> Dict[str, Any]:
+    """Drop cached column metadata after a schema change (one database, or all when omitted)."""
+    # Admin endpoints are only served behind an API key; without one anybody could flush the caches.
+    if not get_settings().api_key:
+        raise ServiceError("Admin endpoints require API_KEY to be configured", "forbidden", status_code=403)
+    catalog.invalidate_catalog(db)
+    # Described result sets are cheap to rebuild, so they are dropped for every database.
+    clear_describe_cache()
+    logger.info("catalog.flushed", extra={"db": db})
+    return {"ok": True, "db": db}
 
 
 @router.post("/inferFromNaturalLanguage", response_model=InferOut)
-def infer_from_nl(payload: Dict[str, Any]) -> Dict[str, Any]:
+async def infer_from_nl(payload: Dict[str, Any]) -> Dict[str, Any]:
     db = payload.get("db") or payload.get("databaseName")
     text = payload.get("text") or payload.get("request")
     title = payload.get("title") or ""
@@ -230,33 +302,39 @@ def infer_from_nl(payload: Dict[str, Any]) -> Dict[str, Any]:
         raise HTTPException(status_code=400, detail="db and text are required")
 
     if _matches_static_nlp(text):
-        response = _build_static_infer_response()
-        _log_api_event("inferFromNaturalLanguage.response", response)
+        _log_api_event("inferFromNaturalLanguage.response", _STATIC_INFER_RESPONSE)
         logger.info("infer.static_response", extra={"db": db, "title": title})
-        return response
-
-    spec_model = parse_intent(text, title)
-    spec_payload = spec_to_payload(spec_model)
-
-    try:
-        columns = catalog.list_columns(db)
-    except Exception as exc:  # pragma: no cover - DB failure path
-        logger.warning("Failed to load columns for %s: %s", db, exc)
-        columns = catalog.demo_columns()
-
-    suggested = map_terms(spec_model, columns)
-    insights = compute_schema_insights(spec_model, suggested, columns)
-
-    response = {
-        "spec": spec_payload,
-        "suggestedMapping": [item.model_dump(exclude_none=True) for item in suggested],
-        "availableColumns": [col.model_dump(exclude_none=True) for col in columns],
-        "schemaInsights": insights.model_dump(),
-    }
+        return Response(content=_STATIC_INFER_BYTES, media_type="application/json")
+
+    cache_key = (db, text, title, catalog.catalog_generation())
+    with _infer_cache_lock:
+        cached = _infer_cache.get(cache_key)
+    if cached is None:
+        # Intent parsing (AOAI round-trip) and the catalog query are independent; overlap them.
+        (spec_model, fell_back), (columns, live) = await asyncio.gather(
+            asyncio.to_thread(parse_intent_with_fallback, text, title),
+            asyncio.to_thread(_load_columns, db),
+        )
+        spec_payload = spec_to_payload(spec_model)
+
+        suggested, insights = await asyncio.to_thread(_map_columns, spec_model, columns)
+
+        response = {
+            "spec": spec_payload,
+            "suggestedMapping": _SUGGESTED_LIST.dump_python(suggested, exclude_none=True),
+            "availableColumns": _COLUMN_META_LIST.dump_python(columns, exclude_none=True),
+            "schemaInsights": insights.model_dump(),
+        }
+        cached = (response, spec_model.title, insights.coveragePercent)
+        # Demo-column and rules-only fallbacks are not remembered so the next request retries.
+        if live and not fell_back:
+            with _infer_cache_lock:
+                _infer_cache[cache_key] = cached
+    response, spec_title, coverage = cached
     _log_api_event("inferFromNaturalLanguage.response", response)
     logger.info(
         "infer.intent",
-        extra={"db": db, "title": spec_model.title, "coveragePercent": insights.coveragePercent},
+        extra={"db": db, "title": spec_title, "coveragePercent": coverage},
     )
     logger.debug("infer.mapping", extra={"mappings": response["suggestedMapping"]})
     return response
@@ -265,63 +343,66 @@ def infer_from_nl(payload: Dict[str, Any]) -> Dict[str, Any]:
 @router.post("/generateSQL", response_model=GenSQLOut)
 def generate_sql(payload: GenSQLIn) -> GenSQLOut:
     _log_api_event("generateSQL.request", payload)
-    mapping_payload = [m.model_dump() for m in payload.mapping]
-    logger.debug(
-        "generateSQL.payload",
-        extra={
-            "db": payload.db,
-            "spec": payload.spec,
-            "mapping": mapping_payload,
-        },
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "generateSQL.payload",
+            extra={
+                "db": payload.db,
+                "spec": payload.spec,
+                "mapping": _MAPPING_LIST.dump_python(payload.mapping),
+            },
+        )
 
     if _spec_is_static(payload.spec):
-        response = _build_static_sql_response()
-        _log_api_event("generateSQL.response", response)
+        _log_api_event("generateSQL.response", _STATIC_GENSQL_RESPONSE)
         logger.info("generateSQL.static_response", extra={"db": payload.db})
-        return response
+        return Response(content=_STATIC_GENSQL_BYTES, media_type="application/json")
 
-    valid_mapping = [m for m in payload.mapping if m.column]
-    if not valid_mapping:
+    mapping_data = _MAPPING_LIST.dump_python([m for m in payload.mapping if m.column], exclude_none=True)
+    if not mapping_data:
         raise ServiceError("At least one mapped column is required", "invalid_mapping", status_code=400)
-    
-    sql_text, params = _build_sql_with_azure(payload.spec, valid_mapping, payload.db)
+
+    sql_text, params = _build_sql_with_azure(payload.spec, mapping_data, payload.db)
     logger.debug("generateSQL.llm", extra={"db": payload.db, "sql": sql_text})
     response = GenSQLOut(sql=sql_text, params=params)
     _log_api_event("generateSQL.response", response)
     return response
 
 
-@router.post("/preview", response_model=PreviewOut)
-def preview(payload: PreviewIn) -> PreviewOut:
+@router.post("/preview", response_model=Union[PreviewOut, PreviewColumnsOut])
+def preview(payload: PreviewIn, cache_bypass: bool = False) -> Union[PreviewOut, PreviewColumnsOut]:
     _log_api_event("preview.request", payload)
     limit = payload.limit or 100
     limit = max(1, min(limit, 500))
-    rows: List[Dict[str, Any]]
+    columns: Tuple[str, ...]
+    data: List[Any]
     if not sql_connection_available():
-        rows = [{"message": "Preview unavailable in this environment"}]
-        response = PreviewOut(rows=rows[:limit], row_count=len(rows))
+        columns = ("message",)
+        data = [("Preview unavailable in this environment",)]
+        response = _preview_response(payload.layout, columns, data[:limit])
         _log_api_event("preview.response", response)
         return response
 
     params = payload.params or {}
-    declares: List[str] = []
-    values: List[Any] = []
-    for key, value in params.items():
-        param_name = key if key.startswith("@") else f"@{key}"
-        declares.append(f"DECLARE {param_name} NVARCHAR(4000) = ?;")
-        values.append(value)
-
-    base_sql, _ = _split_order_by_clause(payload.sql)
-    limited_sql = f"SELECT TOP {limit} * FROM (\n{base_sql}\n) AS src"
-    sql_text = "\n".join(declares + [limited_sql])
+    cache_key = _preview_cache_key(payload.db, payload.sql, params, limit)
+    if not cache_bypass:
+        with _preview_cache_lock:
+            cached = _preview_cache.get(cache_key)
+        if cached is not None:
+            response = _preview_response(payload.layout, *cached)
+            _log_api_event("preview.response", response)
+            return response
+
+    sql_text = _build_preview_sql(payload.sql, tuple(params))
+    values = [*params.values(), limit]
 
     try:
         with contextlib.closing(open_sql_connection(payload.db)) as conn:
             cursor = conn.cursor()
             cursor.execute(sql_text, values)
-            columns = [col[0] for col in cursor.description]
-            rows = [dict(zip(columns, row)) for row in cursor.fetchmany(limit)]
+            columns = tuple(col[0] for col in cursor.description)
+            # SELECT TOP already caps the result, so drain it in one driver call.
+            data = cursor.fetchall()
     except Exception as exc:  # pragma: no cover - DB specific
         logger.exception("preview execution failed", extra={"db": payload.db})
         detail = _summarize_error(exc)
@@ -329,14 +410,38 @@ def preview(payload: PreviewIn) -> PreviewOut:
         if detail:
             message = f"{message}: {detail}"
         raise ServiceError(message, "preview_error", status_code=400) from exc
-    response = PreviewOut(rows=rows, row_count=len(rows))
+    with _preview_cache_lock:
+        _preview_cache[cache_key] = (columns, data)
+    response = _preview_response(payload.layout, columns, data)
     _log_api_event("preview.response", response)
     return response
 
 
 @router.post("/publishReport", response_model=PublishOut)
-def publish_report(payload: PublishIn) -> PublishOut:
+async def publish_report(payload: PublishIn) -> PublishOut:
     _log_api_event("publishReport.request", payload)
+    # SystemInfo is independent of the upload, so fetch it while the report is being published.
+    report_path, server_info = await asyncio.gather(
+        asyncio.to_thread(_publish_to_ssrs, payload),
+        asyncio.to_thread(get_system_info),
+    )
+
+    render_url = make_render_url(report_path, {param.name: str(param.default or "") for param in payload.parameters})
+    echo = payload.model_dump()
+    # echo/dataset_fields come straight from the validated request, so construct without revalidating.
+    response = PublishOut.model_construct(
+        path=report_path,
+        render_url_pdf=render_url,
+        server=server_info or {"status": "unknown"},
+        dataset_fields=echo["columns"],
+        echo=echo,
+    )
+    _log_api_event("publishReport.response", response)
+    return response
+
+
+def _publish_to_ssrs(payload: PublishIn) -> str:
+    """Build the RDL, upload it and bind its data source; returns the report path."""
     dataset_name = payload.report.title.replace(" ", "") or "Dataset"
     sql_text = _build_publish_sql(payload.columns, payload.filters, payload.sort)
     rdl_bytes = build_rdl(
@@ -360,19 +465,7 @@ def publish_report(payload: PublishIn) -> PublishOut:
             )
     except Exception as exc:  # pragma: no cover - network only
         raise ServiceError(f"Failed to publish report: {exc}", "ssrs_upload_failed", status_code=502) from exc
-
-    render_url = make_render_url(upload_result["path"], {param.name: str(param.default or "") for param in payload.parameters})
-    server_info = get_system_info() or {"status": "unknown"}
-
-    response = PublishOut(
-        path=upload_result["path"],
-        render_url_pdf=render_url,
-        server=server_info,
-        dataset_fields=[field.model_dump() for field in payload.columns],
-        echo=payload.model_dump(),
-    )
-    _log_api_event("publishReport.response", response)
-    return response
+    return upload_result["path"]
 
 
 def _build_publish_sql(
@@ -383,30 +476,21 @@ def _build_publish_sql(
     if not columns:
         return "SELECT 1 AS Placeholder"
 
-    select_parts = []
-    table = None
-    for column in columns:
-        if column.source:
-            select_parts.append(f"{column.source} AS [{column.name}]")
-            if table is None:
-                table = column.source.rsplit(".", 1)[0]
-    select_clause = ", ".join(select_parts) if select_parts else "1 AS Placeholder"
-    from_clause = table or "dbo.FactSales"
-
-    sql_lines = ["SELECT", f"    {select_clause}", f"FROM {from_clause}"]
+    sourced = [column for column in columns if column.source]
+    select_clause = ", ".join(f"{column.source} AS [{column.name}]" for column in sourced) or "1 AS Placeholder"
+    from_clause = sourced[0].source.rsplit(".", 1)[0] if sourced else "dbo.FactSales"
 
+    sql = f"SELECT\n    {select_clause}\nFROM {from_clause}"
     if filters:
-        filter_clauses = [f"{flt.field} {flt.op} @{flt.param}" for flt in filters]
-        sql_lines.append("WHERE " + " AND ".join(filter_clauses))
-
+        sql += "\nWHERE " + " AND ".join(f"{flt.field} {flt.op} @{flt.param}" for flt in filters)
     if sort:
-        order_fragments = [f"{item.field} {item.dir.upper()}" for item in sort]
-        sql_lines.append("ORDER BY " + ", ".join(order_fragments))
-
-    return "\n".join(sql_lines)
+        sql += "\nORDER BY " + ", ".join(f"{item.field} {item.dir.upper()}" for item in sort)
+    return sql
 
 
 def _log_api_event(action: str, payload: Optional[Any]) -> None:
+    if not logger.isEnabledFor(logging.INFO):
+        return
     try:
         serialized = _serialize_payload(payload)
     except Exception as exc:  # pragma: no cover - logging safeguard
@@ -418,80 +502,86 @@ def _log_api_event(action: str, payload: Optional[Any]) -> None:
 def _serialize_payload(payload: Optional[Any]) -> Any:
     if payload is None:
         return None
-    if hasattr(payload, "model_dump"):
-        data = payload.model_dump()
-    elif isinstance(payload, (dict, list, str, int, float, bool)):
-        data = payload
+    if hasattr(payload, "model_dump") or isinstance(payload, (dict, list, str, int, float, bool)):
+        data = _clip_for_log(payload)
     else:
         data = str(payload)
-    encoded = jsonable_encoder(data)
-    serialized = json.dumps(encoded, default=str)
-    if len(serialized) > 2000:
-        serialized = serialized[:2000] + "...<truncated>"
+    # orjson handles datetimes/UUIDs natively; anything else falls back to str().
+    serialized = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    if len(serialized) > _LOG_PAYLOAD_MAX_CHARS:
+        serialized = serialized[:_LOG_PAYLOAD_MAX_CHARS] + "...<truncated>"
     return serialized
 
 
+def _clip_for_log(value: Any, depth: int = 0) -> Any:
+    """Shrink a payload to log size before encoding so large rows/RDL never get serialized in full."""
+    if isinstance(value, str):
+        return value if len(value) <= _LOG_MAX_STRING else value[:_LOG_MAX_STRING] + "...<truncated>"
+    if depth >= _LOG_MAX_DEPTH:
+        return "<...>" if isinstance(value, (dict, list, tuple)) or hasattr(value, "model_dump") else value
+    if hasattr(value, "model_dump"):
+        # Walk model fields directly instead of model_dump() so clipped branches are never materialized.
+        return {name: _clip_for_log(getattr(value, name), depth + 1) for name in type(value).model_fields}
+    if isinstance(value, dict):
+        clipped = {key: _clip_for_log(item, depth + 1) for key, item in islice(value.items(), _LOG_MAX_ITEMS)}
+        if len(value) > _LOG_MAX_ITEMS:
+            clipped["..."] = f"{len(value) - _LOG_MAX_ITEMS} more keys"
+        return clipped
+    if isinstance(value, (list, tuple)):
+        clipped_items = [_clip_for_log(item, depth + 1) for item in value[:_LOG_MAX_ITEMS]]
+        if len(value) > _LOG_MAX_ITEMS:
+            clipped_items.append(f"...<truncated {len(value) - _LOG_MAX_ITEMS} items>")
+        return clipped_items
+    return value
+
+
 def _split_order_by_clause(sql: str) -> tuple[str, Optional[str]]:
     """Split off a top-level ORDER BY clause so we can wrap SQL in a derived table."""
-    lower = sql.lower()
     depth = 0
-    in_single = False
-    in_double = False
-    in_line_comment = False
-    in_block_comment = False
-    i = 0
-    while i < len(sql):
-        ch = sql[i]
-        nxt = sql[i + 1] if i + 1 < len(sql) else ""
-
-        if in_line_comment:
-            if ch in "\r\n":
-                in_line_comment = False
-            i += 1
-            continue
-        if in_block_comment:
-            if ch == "*" and nxt == "/":
-                in_block_comment = False
-                i += 2
-                continue
-            i += 1
-            continue
-        if ch == "-" and nxt == "-":
-            in_line_comment = True
-            i += 2
-            continue
-        if ch == "/" and nxt == "*":
-            in_block_comment = True
-            i += 2
-            continue
-
-        if ch == "'" and not in_double:
-            in_single = not in_single
-            i += 1
-            continue
-        if ch == '"' and not in_single:
-            in_double = not in_double
-            i += 1
-            continue
-        if in_single or in_double:
-            i += 1
-            continue
-        if ch == "(":
+    for match in _SQL_TOKEN_RE.finditer(sql):
+        token = match.group()
+        if token == "(":
             depth += 1
-            i += 1
-            continue
-        if ch == ")":
+        elif token == ")":
             depth = max(depth - 1, 0)
-            i += 1
-            continue
-        if depth == 0 and lower.startswith("order by", i):
-            clause = sql[i + len("order by") :].strip()
-            body = sql[:i].rstrip()
-            return body, clause
-        i += 1
+        elif depth == 0 and token[0] in "oO":
+            return sql[: match.start()].rstrip(), sql[match.end() :].strip()
     return sql, None
 
 
+def _preview_cache_key(db: str, sql: str, params: Dict[str, Any], limit: int) -> str:
+    raw = orjson.dumps([db, sql, params, limit], default=str, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _build_preview_sql(sql: str, param_names: Tuple[str, ...]) -> str:
+    """Wrap user SQL in DECLAREs plus a parameterized TOP so repeat previews reuse text and plan."""
+    declares = [f"DECLARE {name if name.startswith('@') else '@' + name} NVARCHAR(4000) = ?;" for name in param_names]
+    base_sql, _ = _split_order_by_clause(sql)
+    return "\n".join(declares + [f"SELECT TOP (?) * FROM (\n{base_sql}\n) AS src"])
+
+
+def _preview_response(
+    layout: str, columns: Tuple[str, ...], data: List[Any]
+) -> Union[PreviewOut, PreviewColumnsOut]:
+    """Shape fetched rows as row dicts (default) or as a column list plus value arrays."""
+    # Built from driver rows, so skip re-validating every cell; FastAPI serializes via the model schema.
+    if layout == "columns":
+        return PreviewColumnsOut.model_construct(
+            columns=list(columns), data=[list(row) for row in data], row_count=len(data)
+        )
+    return PreviewOut.model_construct(rows=[dict(zip(columns, row)) for row in data], row_count=len(data))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag`` (RFC 9110 section 13.1.2)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 def _summarize_error(exc: Exception) -> str:
     """Return a short, user-friendly error summary."""
     detail = str(exc).strip()
@@ -500,43 +590,42 @@ def _summarize_error(exc: Exception) -> str:
     return detail.splitlines()[0][:200]
 
 
-def _build_sql_with_azure(spec: Dict[str, Any], mapping: List[Mapping], db: str) -> Tuple[str, List[Dict[str, Any]]]:
+def _load_columns(db: str) -> Tuple[List[ColumnMetadata], bool]:
+    """Return the columns for ``db`` and whether they came from the catalog (not the demo fallback)."""
+    try:
+        return catalog.list_columns(db), True
+    except Exception as exc:  # pragma: no cover - DB failure path
+        logger.warning("Failed to load columns for %s: %s", db, exc)
+        return catalog.demo_columns(), False
+
+
+def _map_columns(spec: NLSpec, columns: List[ColumnMetadata]) -> Tuple[List[SuggestedMappingItem], SchemaInsights]:
+    suggested = map_terms(spec, columns)
+    return suggested, compute_schema_insights(spec, suggested, columns)
+
+
+def _build_sql_with_azure(
+    spec: Dict[str, Any], mapping_data: List[Dict[str, Any]], db: str
+) -> Tuple[str, List[Dict[str, Any]]]:
     if not azure_openai.is_configured():
         raise RuntimeError("Azure OpenAI is not configured")
-    mapping_data = [
-        {k: v for k, v in item.model_dump().items() if v is not None}
-        for item in mapping
-    ]
     user_payload = {
         "database": db,
         "spec": spec,
         "mapping": mapping_data,
-        "rules": {
-            "dialect": "SQL Server",
-            "aggregate_measures": True,
-            "group_dimensions": True,
-        },
+        "rules": _SQL_RULES,
     }
     messages = [
-        {
-            "role": "system",
-            "content": (
-                "You generate SQL Server SELECT statements for SSRS datasets. "
-                "Only reference columns provided in the mapping. "
-                "Always return JSON with keys 'sql' and 'params'. "
-                "If no measures are supplied, use COUNT(1) AS RowCount. "
-                "Parameters must include JSON objects with fields name, rdlType, and optionally value."
-            ),
-        },
+        _SQL_SYSTEM_MESSAGE,
         {
             "role": "user",
-            "content": json.dumps(user_payload, indent=2),
+            "content": orjson.dumps(user_payload, option=orjson.OPT_INDENT_2).decode(),
         },
     ]
     content = azure_openai.chat_completion(messages, response_format={"type": "json_object"})
     try:
-        data = json.loads(content)
-    except json.JSONDecodeError as exc:  # pragma: no cover - depends on remote service
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError as exc:  # pragma: no cover - depends on remote service
         raise RuntimeError(f"Invalid JSON from Azure OpenAI: {exc}") from exc
     sql_text = data.get("sql")
     if not sql_text:
@@ -565,25 +654,17 @@ def _normalize_llm_params(raw_params: Any) -> List[Dict[str, Any]]:
 
 
 def _infer_param_type(field_name: str) -> str:
-    lowered = field_name.lower()
-    if "date" in lowered or "time" in lowered:
+    if _PARAM_DATE_RE.search(field_name):
         return "DateTime"
-    if any(token in lowered for token in ("amount", "qty", "count", "total")):
+    if _PARAM_FLOAT_RE.search(field_name):
         return "Float"
     return "String"
 
 
 def _matches_static_nlp(text: str) -> bool:
-    return text.casefold() == STATIC_NLP_TRIGGER.casefold()
+    # casefold() never shortens a string, so anything longer than the trigger cannot match.
+    return len(text) <= _STATIC_NLP_TRIGGER_MAX_LEN and text.casefold() in _STATIC_NLP_TRIGGERS
 
 
 def _spec_is_static(spec: Dict[str, Any]) -> bool:
     return isinstance(spec, dict) and spec.get("_staticPresetId") == STATIC_PRESET_ID
-
-
-def _build_static_infer_response() -> Dict[str, Any]:
-    return copy.deepcopy(_STATIC_INFER_RESPONSE)
-
-
-def _build_static_sql_response() -> GenSQLOut:
-    return GenSQLOut(**_STATIC_GENSQL_RESPONSE)
@@ -1,7 +1,68 @@
 """Schema discovery utilities for SSRS RDL generation."""
+import operator
 import re
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Tuple
 import pyodbc
+from cachetools import TTLCache
+
+
+# Compiled once at import; these run for every described query and every field name.
+_PARAM_RE = re.compile(r'(?<!@)@(\w+)')  # @ParamName but not @@SERVERNAME
+_NON_IDENT_RE = re.compile(r'[^A-Za-z0-9_]')
+_SELECT_FROM_RE = re.compile(r'\bSELECT\s+(.*?)\s+FROM\b', re.IGNORECASE | re.DOTALL)
+_ALIAS_RE = re.compile(r'\bAS\s+(\w+)\s*$', re.IGNORECASE)
+_TRAILING_IDENT_RE = re.compile(r'[\w\.]+$')
+_SELECT_SPLIT_RE = re.compile(r'[(),]')
+_SANITIZE_TABLE = str.maketrans(
+    {chr(c): '_' for c in range(128) if not (chr(c).isalnum() or chr(c) == '_')}
+)
+
+# Note attached when the field list had to be guessed from the SELECT text
+HEURISTIC_NOTE = "schema inferred heuristically"
+
+# Described schemas keyed by (database, sql) so regenerating a report can skip the connection entirely.
+# This is the only schema cache; callers always receive copies.
+_describe_cache: TTLCache = TTLCache(maxsize=256, ttl=600)
+_describe_cache_lock = threading.Lock()
+
+# SQL Server base type -> RDL .NET type
+_SQL_TO_RDL: Dict[str, str] = {
+    'int': 'System.Int32',
+    'smallint': 'System.Int32',
+    'tinyint': 'System.Int32',
+    'bigint': 'System.Int64',
+    'bit': 'System.Boolean',
+    'decimal': 'System.Decimal',
+    'numeric': 'System.Decimal',
+    'money': 'System.Decimal',
+    'smallmoney': 'System.Decimal',
+    'float': 'System.Double',
+    'real': 'System.Double',
+    'date': 'System.DateTime',
+    'datetime': 'System.DateTime',
+    'datetime2': 'System.DateTime',
+    'smalldatetime': 'System.DateTime',
+    'time': 'System.DateTime',
+    'datetimeoffset': 'System.DateTime',
+}
+
+# pyodbc SQL_* type code -> RDL .NET type (best-effort)
+_PYODBC_TYPE_TO_RDL: Dict[int, str] = {
+    pyodbc.SQL_INTEGER: 'System.Int32',
+    pyodbc.SQL_SMALLINT: 'System.Int32',
+    pyodbc.SQL_TINYINT: 'System.Int32',
+    pyodbc.SQL_BIGINT: 'System.Int64',
+    pyodbc.SQL_BIT: 'System.Boolean',
+    pyodbc.SQL_DECIMAL: 'System.Decimal',
+    pyodbc.SQL_NUMERIC: 'System.Decimal',
+    pyodbc.SQL_FLOAT: 'System.Double',
+    pyodbc.SQL_REAL: 'System.Double',
+    pyodbc.SQL_DOUBLE: 'System.Double',
+    pyodbc.SQL_TYPE_TIMESTAMP: 'System.DateTime',
+    pyodbc.SQL_TYPE_DATE: 'System.DateTime',
+    pyodbc.SQL_TYPE_TIME: 'System.DateTime',
+}
 
 
 class FieldSpec:
@@ -28,20 +89,8 @@ def get_parameters(sql: str) -> List[str]:
     Returns:
         List of parameter names (without leading @)
     """
-    # Pattern to match @ParamName but not @@SERVERNAME
-    pattern = r'(?<!@)@(\w+)'
-    
-    matches = re.findall(pattern, sql)
-    
-    # De-duplicate while preserving order
-    seen = set()
-    params = []
-    for match in matches:
-        if match not in seen:
-            seen.add(match)
-            params.append(match)
-    
-    return params
+    # dict.fromkeys de-duplicates while preserving order of first appearance
+    return list(dict.fromkeys(_PARAM_RE.findall(sql)))
 
 
 def sql_type_to_rdl_type(sql_type: str) -> str:
@@ -54,33 +103,8 @@ def sql_type_to_rdl_type(sql_type: str) -> str:
     Returns:
         RDL .NET type (e.g., System.String, System.Int32, etc.)
     """
-    sql_type_lower = sql_type.lower()
-    
-    # Integer types
-    if sql_type_lower in ('int', 'smallint', 'tinyint'):
-        return 'System.Int32'
-    
-    if sql_type_lower == 'bigint':
-        return 'System.Int64'
-    
-    # Boolean
-    if sql_type_lower == 'bit':
-        return 'System.Boolean'
-    
-    # Decimal types
-    if sql_type_lower in ('decimal', 'numeric', 'money', 'smallmoney'):
-        return 'System.Decimal'
-    
-    # Floating point
-    if sql_type_lower in ('float', 'real'):
-        return 'System.Double'
-    
-    # Date/Time
-    if sql_type_lower in ('date', 'datetime', 'datetime2', 'smalldatetime', 'time', 'datetimeoffset'):
-        return 'System.DateTime'
-    
-    # Default to String for everything else
-    return 'System.String'
+    # Everything not listed (char/text/xml/binary/...) maps to String
+    return _SQL_TO_RDL.get(sql_type.lower(), 'System.String')
 
 
 def sanitize_field_name(name: str) -> str:
@@ -94,11 +118,14 @@ def sanitize_field_name(name: str) -> str:
     Returns:
         Sanitized field name
     """
-    # Replace spaces and special chars with underscore
-    sanitized = re.sub(r'[^A-Za-z0-9_]', '_', name)
+    # Replace spaces and special chars with underscore (single C-level pass for ASCII names)
+    if name.isascii():
+        sanitized = name.translate(_SANITIZE_TABLE)
+    else:
+        sanitized = _NON_IDENT_RE.sub('_', name)
     
     # Remove leading numbers or underscores
-    sanitized = re.sub(r'^[0-9_]+', '', sanitized)
+    sanitized = sanitized.lstrip('0123456789_')
     
     # If empty after sanitization, use a default
     if not sanitized:
@@ -121,17 +148,15 @@ def deduplicate_field_names(names: List[str]) -> List[str]:
     result = []
     
     for name in names:
-        if name not in seen:
-            seen[name] = 1
-            result.append(name)
-        else:
-            seen[name] += 1
-            result.append(f"{name}_{seen[name]}")
+        count = seen[name] = seen.get(name, 0) + 1
+        result.append(name if count == 1 else f"{name}_{count}")
     
     return result
 
 
-def describe_result_set(sql: str, conn: pyodbc.Connection) -> tuple[List[FieldSpec], Optional[str]]:
+def describe_result_set(
+    sql: str, conn: pyodbc.Connection, database: Optional[str] = None
+) -> tuple[List[FieldSpec], Optional[str]]:
     """
     Discover result set columns and types without retrieving data.
     
@@ -143,14 +168,21 @@ def describe_result_set(sql: str, conn: pyodbc.Connection) -> tuple[List[FieldSp
     Args:
         sql: SQL query text
         conn: pyodbc Connection object
+        database: Database the connection points at; read from the connection when omitted
         
     Returns:
         Tuple of (list of FieldSpec objects, optional note message)
     """
+    cache_key = _describe_cache_key(sql, conn, database)
+    cached = _lookup_fields(cache_key)
+    if cached is not None:
+        return cached
+    
     # Try primary method: sp_describe_first_result_set
     try:
         fields, note = _describe_via_sp(sql, conn)
         if fields:
+            _remember_fields(cache_key, fields, note)
             return fields, note
     except Exception:
         pass  # Fall through to next method
@@ -159,15 +191,71 @@ def describe_result_set(sql: str, conn: pyodbc.Connection) -> tuple[List[FieldSp
     try:
         fields, note = _describe_via_schema_only(sql, conn)
         if fields:
+            _remember_fields(cache_key, fields, note)
             return fields, note
     except Exception:
         pass  # Fall through to next method
     
-    # Fallback B: heuristic parsing
+    # Fallback B: heuristic parsing (not cached, so the server is asked again next time)
     fields, note = _describe_via_heuristic(sql)
     return fields, note
 
 
+def cached_result_set(sql: str, database: str) -> Optional[tuple[List[FieldSpec], Optional[str]]]:
+    """
+    Return a previously described result set without touching the database.
+    
+    Args:
+        sql: SQL query text
+        database: Database the query was described against
+        
+    Returns:
+        Tuple of (copied FieldSpec list, optional note), or None when not cached
+    """
+    return _lookup_fields((database, sql))
+
+
+def clear_describe_cache() -> None:
+    """Forget all described result sets, e.g. after schema changes."""
+    with _describe_cache_lock:
+        _describe_cache.clear()
+
+
+def _describe_cache_key(
+    sql: str, conn: pyodbc.Connection, database: Optional[str]
+) -> Optional[Tuple[str, str]]:
+    """Key a described query by the database it ran against; None disables caching."""
+    if database:
+        return database, sql
+    try:
+        return conn.getinfo(pyodbc.SQL_DATABASE_NAME), sql
+    except Exception:
+        return None
+
+
+def _lookup_fields(cache_key: Optional[Tuple[str, str]]) -> Optional[tuple[List[FieldSpec], Optional[str]]]:
+    if cache_key is None:
+        return None
+    with _describe_cache_lock:
+        cached = _describe_cache.get(cache_key)
+    if cached is None:
+        return None
+    fields, note = cached
+    return _copy_fields(fields), note
+
+
+def _copy_fields(fields: List[FieldSpec]) -> List[FieldSpec]:
+    # FieldSpec is mutable, so callers never share instances with the cache
+    return [FieldSpec(field.name, field.rdl_type) for field in fields]
+
+
+def _remember_fields(cache_key: Optional[Tuple[str, str]], fields: List[FieldSpec], note: Optional[str]) -> None:
+    if cache_key is None:
+        return
+    with _describe_cache_lock:
+        _describe_cache[cache_key] = (_copy_fields(fields), note)
+
+
 def _describe_via_sp(sql: str, conn: pyodbc.Connection) -> tuple[List[FieldSpec], Optional[str]]:
     """
     Use sp_describe_first_result_set to discover schema.
@@ -181,20 +269,25 @@ def _describe_via_sp(sql: str, conn: pyodbc.Connection) -> tuple[List[FieldSpec]
     """
     cursor = conn.cursor()
     
-    # Escape single quotes in SQL
-    escaped_sql = sql.replace("'", "''")
+    # Bind the query text as a parameter so the EXEC statement itself stays constant
+    cursor.execute("EXEC sys.sp_describe_first_result_set @tsql = ?", sql)
+    
+    rows = cursor.fetchall()
+    if not rows:
+        return [], None
     
-    # Execute sp_describe_first_result_set
-    sp_query = f"EXEC sys.sp_describe_first_result_set @tsql = N'{escaped_sql}'"
-    cursor.execute(sp_query)
+    # Row structure from sp_describe_first_result_set:
+    # is_hidden, column_ordinal, name, is_nullable, system_type_id, system_type_name, ...
+    # Pick named or positional access once from the first row instead of probing every row.
+    first = rows[0]
+    if all(hasattr(first, attr) for attr in ('is_hidden', 'name', 'system_type_name')):
+        get_columns = operator.attrgetter('is_hidden', 'name', 'system_type_name')
+    else:
+        get_columns = operator.itemgetter(0, 2, 5)
     
     fields = []
-    for row in cursor.fetchall():
-        # Row structure from sp_describe_first_result_set:
-        # is_hidden, column_ordinal, name, is_nullable, system_type_id, system_type_name, ...
-        is_hidden = row.is_hidden if hasattr(row, 'is_hidden') else row[0]
-        name = row.name if hasattr(row, 'name') else row[2]
-        system_type_name = row.system_type_name if hasattr(row, 'system_type_name') else row[5]
+    for row in rows:
+        is_hidden, name, system_type_name = get_columns(row)
         
         if is_hidden:
             continue
@@ -239,25 +332,17 @@ def _describe_via_schema_only(sql: str, conn: pyodbc.Connection) -> tuple[List[F
         cursor.execute("SET FMTONLY ON")
         cursor.execute(sql)
         
-        fields = []
-        if cursor.description:
-            for col in cursor.description:
-                name = col[0]
-                type_code = col[1]
-                
-                # Map pyodbc type code to SQL type
-                rdl_type = _pyodbc_type_to_rdl(type_code)
-                safe_name = sanitize_field_name(name)
-                
-                fields.append(FieldSpec(safe_name, rdl_type))
+        # pyodbc rebuilds the description tuple on every access, so read it once
+        description = cursor.description or ()
         
         cursor.execute("SET FMTONLY OFF")
         
-        # De-duplicate
-        field_names = [f.name for f in fields]
-        unique_names = deduplicate_field_names(field_names)
-        for i, field in enumerate(fields):
-            field.name = unique_names[i]
+        # Sanitize and de-duplicate names, mapping pyodbc type codes to RDL types
+        unique_names = deduplicate_field_names([sanitize_field_name(col[0]) for col in description])
+        fields = [
+            FieldSpec(name, _pyodbc_type_to_rdl(col[1]))
+            for name, col in zip(unique_names, description)
+        ]
         
         return fields, "schema discovered via FMTONLY"
     except Exception:
@@ -277,12 +362,11 @@ def _describe_via_heuristic(sql: str) -> tuple[List[FieldSpec], str]:
         Tuple of (list of FieldSpec with System.String types, note message)
     """
     # Find SELECT clause
-    select_pattern = r'\bSELECT\s+(.*?)\s+FROM\b'
-    match = re.search(select_pattern, sql, re.IGNORECASE | re.DOTALL)
+    match = _SELECT_FROM_RE.search(sql)
     
     if not match:
         # No SELECT found, return a single placeholder field
-        return [FieldSpec('Column1', 'System.String')], "schema inferred heuristically"
+        return [FieldSpec('Column1', 'System.String')], HEURISTIC_NOTE
     
     select_list = match.group(1)
     
@@ -292,12 +376,12 @@ def _describe_via_heuristic(sql: str) -> tuple[List[FieldSpec], str]:
     fields = []
     for i, col in enumerate(columns):
         # Extract alias if present (AS alias or trailing identifier)
-        alias_match = re.search(r'\bAS\s+(\w+)\s*$', col, re.IGNORECASE)
+        alias_match = _ALIAS_RE.search(col)
         if alias_match:
             name = alias_match.group(1)
         else:
             # Try to extract trailing identifier
-            trailing_match = re.search(r'[\w\.]+$', col.strip())
+            trailing_match = _TRAILING_IDENT_RE.search(col.strip())
             if trailing_match:
                 name = trailing_match.group(0).split('.')[-1]  # Take last part if dotted
             else:
@@ -312,7 +396,7 @@ def _describe_via_heuristic(sql: str) -> tuple[List[FieldSpec], str]:
     for i, field in enumerate(fields):
         field.name = unique_names[i]
     
-    return fields, "schema inferred heuristically"
+    return fields, HEURISTIC_NOTE
 
 
 def _split_select_list(select_list: str) -> List[str]:
@@ -326,25 +410,22 @@ def _split_select_list(select_list: str) -> List[str]:
         List of column expressions
     """
     depth = 0
-    current = []
+    last = 0
     columns = []
     
-    for char in select_list:
+    # Only parentheses and commas matter; everything between them is sliced in bulk
+    for match in _SELECT_SPLIT_RE.finditer(select_list):
+        char = match.group()
         if char == '(':
             depth += 1
-            current.append(char)
         elif char == ')':
             depth -= 1
-            current.append(char)
-        elif char == ',' and depth == 0:
-            columns.append(''.join(current).strip())
-            current = []
-        else:
-            current.append(char)
+        elif depth == 0:
+            columns.append(select_list[last:match.start()].strip())
+            last = match.end()
     
     # Add last column
-    if current:
-        columns.append(''.join(current).strip())
+    columns.append(select_list[last:].strip())
     
     return [col for col in columns if col]
 
@@ -359,21 +440,4 @@ def _pyodbc_type_to_rdl(type_code) -> str:
     Returns:
         RDL .NET type string
     """
-    # pyodbc type mapping (approximate)
-    # This is a best-effort mapping
-    import pyodbc
-    
-    if type_code == pyodbc.SQL_INTEGER or type_code == pyodbc.SQL_SMALLINT or type_code == pyodbc.SQL_TINYINT:
-        return 'System.Int32'
-    elif type_code == pyodbc.SQL_BIGINT:
-        return 'System.Int64'
-    elif type_code == pyodbc.SQL_BIT:
-        return 'System.Boolean'
-    elif type_code == pyodbc.SQL_DECIMAL or type_code == pyodbc.SQL_NUMERIC:
-        return 'System.Decimal'
-    elif type_code == pyodbc.SQL_FLOAT or type_code == pyodbc.SQL_REAL or type_code == pyodbc.SQL_DOUBLE:
-        return 'System.Double'
-    elif type_code == pyodbc.SQL_TYPE_TIMESTAMP or type_code == pyodbc.SQL_TYPE_DATE or type_code == pyodbc.SQL_TYPE_TIME:
-        return 'System.DateTime'
-    else:
-        return 'System.String'
+    return _PYODBC_TYPE_TO_RDL.get(type_code, 'System.String')
@@ -11,6 +11,7 @@ Role = Literal["measure", "dimension", "time", "metric"]
 SuggestedRole = Literal["metric", "dimension"]
 Grain = Literal["day", "week", "month", "quarter", "year"]
 IntentGrain = Literal["day", "week", "month", "quarter", "year", "none"]
+PreviewLayout = Literal["rows", "columns"]
 
 
 class IntentFilter(BaseModel):
@@ -131,6 +132,7 @@ class PreviewIn(BaseModel):
     sql: str
     params: Dict[str, Any] = Field(default_factory=dict)
     limit: int = 100
+    layout: PreviewLayout = "rows"
 
 
 class PreviewOut(BaseModel):
@@ -138,6 +140,14 @@ class PreviewOut(BaseModel):
     row_count: int
 
 
+class PreviewColumnsOut(BaseModel):
+    """Columnar preview: column names once, then one value array per row."""
+
+    columns: List[str]
+    data: List[List[Any]]
+    row_count: int
+
+
 class PublishIn(BaseModel):
     db: DbRef
     report: ReportTarget
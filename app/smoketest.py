@@ -7,12 +7,15 @@ from typing import Dict, Optional
 from .config import get_settings
 
 
+# Every render URL starts with the same encoded pair; only report parameters vary.
+_RENDER_QUERY = urlencode([("rs:Command", "Render"), ("rs:Format", "PDF")])
+
+
 def make_render_url(item_path: str, default_params: Optional[Dict[str, str]] = None) -> str:
     settings = get_settings()
     base = settings.render_base.rstrip("/")
     path = item_path if item_path.startswith("/") else f"/{item_path}"
-    query_items = [("rs:Command", "Render"), ("rs:Format", "PDF")]
-    for key, value in (default_params or {}).items():
-        query_items.append((key, value))
-    query = urlencode(query_items, doseq=True)
-    return f"{base}?{quote(path, safe='/')}" + (f"&{query}" if query else "")
+    query = _RENDER_QUERY
+    if default_params:
+        query = f"{query}&{urlencode(default_params, doseq=True)}"
+    return f"{base}?{quote(path, safe='/')}&{query}"
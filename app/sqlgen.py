@@ -1,6 +1,7 @@
 """SQL text generation based on inferred intent and mappings."""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from .schemas import Mapping
@@ -13,16 +14,22 @@ TIME_GRAINS = {
     "year": "DATEFROMPARTS(YEAR({col}), 1, 1)",
 }
 
+# Templates pre-split on "{col}" so a bucket is one str.join instead of a str.format parse.
+_TIME_GRAIN_PARTS = {grain: tuple(template.split("{col}")) for grain, template in TIME_GRAINS.items()}
+_DIMENSION_ROLES = frozenset({"dimension"})
+_MEASURE_ROLES = frozenset({"measure", "metric"})
+_BRACKET_STRIP = str.maketrans("", "", "[]")
+
 
 def _time_bucket(column: Optional[str], grain: Optional[str]) -> Tuple[str, Optional[str]]:
     if not column:
         return "OrderDate", None
     if not grain:
         return column, None
-    template = TIME_GRAINS.get(grain)
-    if not template:
+    parts = _TIME_GRAIN_PARTS.get(grain)
+    if not parts:
         return column, None
-    bucket = template.format(col=column)
+    bucket = column.join(parts)
     return bucket, f"{grain.title()}Bucket"
 
 
@@ -45,22 +52,33 @@ def _infer_param_type(field_name: str) -> str:
     return "String"
 
 
+@lru_cache(maxsize=2048)
 def _plain_column(column: str) -> str:
-    cleaned = column.replace("[", "").replace("]", "")
-    cleaned = cleaned.replace("].[", ".")
-    cleaned = cleaned.replace("].", ".").replace(".[", ".")
-    return cleaned
+    # Dropping every bracket also covers the "].[" / "]." / ".[" separators.
+    return column.translate(_BRACKET_STRIP)
 
 
+@lru_cache(maxsize=2048)
 def _column_alias(column: str) -> str:
     plain = _plain_column(column)
     return plain.split(".")[-1]
 
 
 def build_sql(spec: Dict[str, Any], mapping: List[Mapping]) -> Tuple[str, List[Dict[str, Any]]]:
-    dims: List[str] = [m.column for m in mapping if m.role in {"dimension"} and m.column]
-    measures: List[str] = [m.column for m in mapping if m.role in {"measure", "metric"} and m.column]
-    time_mapping = next((m.column for m in mapping if m.role == "time" and m.column), None)
+    dims: List[str] = []
+    measures: List[str] = []
+    time_mapping: Optional[str] = None
+    for m in mapping:
+        column = m.column
+        if not column:
+            continue
+        role = m.role
+        if role in _DIMENSION_ROLES:
+            dims.append(column)
+        elif role in _MEASURE_ROLES:
+            measures.append(column)
+        elif role == "time" and time_mapping is None:
+            time_mapping = column
 
     select_parts: List[str] = []
     group_parts: List[str] = []
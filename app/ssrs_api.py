@@ -1,19 +1,19 @@
 """SSRS RDL generation API endpoint."""
+import asyncio
 import logging
 import os
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 from .conn import open_connection
-from .schema_discovery import get_parameters, describe_result_set
+from .schema_discovery import FieldSpec, get_parameters, describe_result_set, cached_result_set
 from .rdl_builder import build_rdl
 from .config import get_settings
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
 router = APIRouter(prefix="/report", tags=["ssrs"])
 
@@ -62,7 +62,7 @@ class SSRSErrorResponse(BaseModel):
     400: {"model": SSRSErrorResponse},
     500: {"model": SSRSErrorResponse}
 })
-def ssrs_generate(request: SSRSGenerateRequest) -> SSRSGenerateResponse:
+async def ssrs_generate(request: SSRSGenerateRequest) -> SSRSGenerateResponse:
     """
     Generate an SSRS RDL file from a raw SQL query.
     
@@ -84,6 +84,23 @@ def ssrs_generate(request: SSRSGenerateRequest) -> SSRSGenerateResponse:
     if not request.db_name or not request.db_name.strip():
         raise HTTPException(status_code=400, detail="db_name cannot be empty")
     
+    # Reject oversized or administrative SQL before spending a database round-trip on it
+    settings = get_settings()
+    if len(request.sql) > settings.max_sql_chars:
+        raise HTTPException(
+            status_code=413,
+            detail=f"SQL query exceeds {settings.max_sql_chars} characters"
+        )
+    
+    denied = settings.sql_denied_keywords_re
+    if denied is not None:
+        match = denied.search(request.sql)
+        if match:
+            raise HTTPException(
+                status_code=400,
+                detail=f"SQL keyword not allowed: {match.group(0).upper()}"
+            )
+    
     # Use defaults if not provided
     report_name = request.report_name or "AutoReport"
     data_source_name = request.data_source_name or "AutoDataSource"
@@ -97,39 +114,24 @@ def ssrs_generate(request: SSRSGenerateRequest) -> SSRSGenerateResponse:
         parameters = get_parameters(request.sql)
         logger.info(f"Detected {len(parameters)} parameters: {parameters}")
         
-        # Step 2: Discover schema
-        logger.info(f"Connecting to database: {request.db_name}")
-        try:
-            conn = open_connection(request.db_name)
-        except Exception as e:
-            logger.error(f"Failed to connect to database: {e}")
+        # Step 2: Discover schema (regenerating the same report reuses the cached result)
+        fields, note = await _discover_schema(request.sql, request.db_name)
+        
+        if note:
+            notes.append(note)
+        
+        if not fields:
+            # Shouldn't happen as heuristic always returns at least one field
             raise HTTPException(
-                status_code=500, 
-                detail=f"Failed to connect to database '{request.db_name}': {str(e)}"
+                status_code=500,
+                detail="Failed to discover any fields from the query"
             )
         
-        try:
-            logger.info("Discovering result set schema")
-            fields, note = describe_result_set(request.sql, conn)
-            
-            if note:
-                notes.append(note)
-            
-            if not fields:
-                # Shouldn't happen as heuristic always returns at least one field
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to discover any fields from the query"
-                )
-            
-            logger.info(f"Discovered {len(fields)} fields: {[f.name for f in fields]}")
-            
-        finally:
-            conn.close()
+        logger.info(f"Discovered {len(fields)} fields: {[f.name for f in fields]}")
         
         # Step 3: Build RDL
         logger.info("Building RDL document")
-        server_value = f"{settings.sql_server_host},{settings.sql_server_port}"
+        server_value = settings.sql_server_address
         
         rdl_content = build_rdl(
             report_name=report_name,
@@ -144,28 +146,19 @@ def ssrs_generate(request: SSRSGenerateRequest) -> SSRSGenerateResponse:
         
         # Step 4: Write to file
         logger.info(f"Writing RDL to: {request.output_path}")
-        output_file = Path(request.output_path)
-        
-        # Create directory if needed
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write file (UTF-8 encoding)
-        output_file.write_text(rdl_content, encoding='utf-8')
-        
-        # Resolve absolute path for response
-        saved_path = str(output_file.resolve())
+        saved_path = await asyncio.to_thread(_write_rdl_file, Path(request.output_path), rdl_content)
         
         logger.info(f"Successfully generated RDL: {saved_path}")
         
-        # Step 5: Build response
-        response = SSRSGenerateResponse(
+        # Step 5: Build response (all values are produced here, so construct without re-validating)
+        response = SSRSGenerateResponse.model_construct(
             status="success",
             saved_path=saved_path,
             report_name=report_name,
             data_source=data_source_name,
             data_set=data_set_name,
-            fields=[FieldInfo(name=f.name, rdlType=f.rdl_type) for f in fields],
-            parameters=[ParameterInfo(name=p, type="String") for p in parameters],
+            fields=[FieldInfo.model_construct(name=f.name, rdlType=f.rdl_type) for f in fields],
+            parameters=[ParameterInfo.model_construct(name=p, type="String") for p in parameters],
             notes=notes
         )
         
@@ -181,3 +174,34 @@ def ssrs_generate(request: SSRSGenerateRequest) -> SSRSGenerateResponse:
             status_code=500,
             detail=f"Internal error: {str(e)}"
         )
+
+
+def _write_rdl_file(output_file: Path, rdl_content: bytes) -> str:
+    """Write the RDL (already UTF-8 bytes) and return its absolute path; runs on a worker thread."""
+    # Create directory if needed
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_bytes(rdl_content)
+    return str(output_file.resolve())
+
+
+async def _discover_schema(sql: str, db_name: str) -> Tuple[List[FieldSpec], Optional[str]]:
+    """Describe ``sql`` against ``db_name``, skipping the connection when the schema is cached."""
+    cached = cached_result_set(sql, db_name)
+    if cached is not None:
+        return cached
+    
+    logger.info(f"Connecting to database: {db_name}")
+    try:
+        conn = await asyncio.to_thread(open_connection, db_name)
+    except Exception as e:
+        logger.error(f"Failed to connect to database: {e}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Failed to connect to database '{db_name}': {str(e)}"
+        )
+    
+    try:
+        logger.info("Discovering result set schema")
+        return await asyncio.to_thread(describe_result_set, sql, conn, db_name)
+    finally:
+        await asyncio.to_thread(conn.close)
@@ -1,12 +1,42 @@
 """Lightweight SSRS REST API helpers."""
 from __future__ import annotations
 
+import re
+import threading
 from typing import Any, Dict, Optional
+from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from cachetools import TTLCache
 
 from .config import get_settings
 
+# Catalog item ids are GUIDs; anything else is addressed by path.
+_ITEM_ID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+# SystemInfo is static server metadata; remember successful lookups for a while.
+_system_info_cache: TTLCache = TTLCache(maxsize=4, ttl=600)
+_system_info_lock = threading.Lock()
+
+# One keep-alive session for all REST calls so publish does not pay a new handshake per request.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Keep enough idle sockets for concurrent publishes running on worker threads.
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
 
 def _base_url() -> str:
     base = get_settings().render_base.rstrip("/")
@@ -14,10 +44,18 @@ def _base_url() -> str:
 
 
 def get_system_info() -> Optional[Dict[str, Any]]:
+    url = f"{_base_url()}/SystemInfo"
+    with _system_info_lock:
+        cached = _system_info_cache.get(url)
+    if cached is not None:
+        return dict(cached)
     try:
-        resp = requests.get(f"{_base_url()}/SystemInfo", timeout=10)
+        resp = _get_session().get(url, timeout=10)
         if resp.ok:
-            return resp.json()
+            info = resp.json()
+            with _system_info_lock:
+                _system_info_cache[url] = info
+            return dict(info)
     except requests.RequestException:  # pragma: no cover - network only
         return None
     return None
@@ -25,15 +63,11 @@ def get_system_info() -> Optional[Dict[str, Any]]:
 
 def set_report_datasources(report_path_or_id: str, refs: list[dict]) -> bool:
     payload = {"DataSources": refs}
-    candidates = [
-        f"{_base_url()}/Reports({report_path_or_id})/DataSources",
-        f"{_base_url()}/Reports(Path='{quote(report_path_or_id, safe='/')}')/DataSources",
-    ]
-    for url in candidates:
-        try:
-            resp = requests.put(url, json=payload, timeout=10)
-            if resp.ok:
-                return True
-        except requests.RequestException:  # pragma: no cover
-            continue
-    return False
+    if _ITEM_ID_RE.fullmatch(report_path_or_id):
+        url = f"{_base_url()}/Reports({report_path_or_id})/DataSources"
+    else:
+        url = f"{_base_url()}/Reports(Path='{quote(report_path_or_id, safe='/')}')/DataSources"
+    try:
+        return _get_session().put(url, json=payload, timeout=10).ok
+    except requests.RequestException:  # pragma: no cover
+        return False
@@ -1,15 +1,22 @@
 """SSRS SOAP helpers built on zeep."""
 from __future__ import annotations
 
+import logging
 import os
 from functools import lru_cache
 
 from requests_ntlm import HttpNtlmAuth
 from zeep import Client
+from zeep.cache import SqliteCache
 from zeep.transports import Transport
 
 from .config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# WSDL/XSD documents rarely change; keep them on disk for a day so workers skip the download.
+_WSDL_CACHE_TTL = 86400
+
 
 @lru_cache(maxsize=1)
 def _client() -> Client:
@@ -22,10 +29,19 @@ def _client() -> Client:
 
         session = requests.Session()
         session.auth = HttpNtlmAuth(user, password)
-    transport = Transport(session=session, timeout=15)
+    cache = SqliteCache(path=settings.ssrs_wsdl_cache_path or None, timeout=_WSDL_CACHE_TTL)
+    transport = Transport(cache=cache, session=session, timeout=15)
     return Client(settings.ssrs_soap_wsdl, transport=transport)
 
 
+def warm_client() -> None:
+    """Load the WSDL ahead of the first publish; failures are logged and retried on first use."""
+    try:
+        _client()
+    except Exception as exc:  # pragma: no cover - depends on SSRS availability
+        logger.warning("SSRS SOAP client warm-up failed: %s", exc)
+
+
 def upload_rdl(folder: str, name: str, rdl_bytes: bytes) -> dict:
     client = _client()
     result = client.service.CreateCatalogItem(
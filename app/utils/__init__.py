@@ -1,5 +1,6 @@
 """Utility helpers package."""
 
 from .logging import configure_logging
+from .security import make_require_api_key
 
-__all__ = ["configure_logging"]
+__all__ = ["configure_logging", "make_require_api_key"]
@@ -1,30 +1,33 @@
 """Logging helpers that emit JSON per-request records."""
 from __future__ import annotations
 
-import json
 import logging
 import sys
 from typing import Any
 
+import orjson
 from starlette.requests import Request
 
 
 class JsonRequestFormatter(logging.Formatter):
     """Formatter that renders structured JSON log records."""
 
+    _CONTEXT_ATTRS = ("request_id", "path", "method", "status_code")
+
     def format(self, record: logging.LogRecord) -> str:  # pragma: no cover - exercised via logging
         payload: dict[str, Any] = {
             "level": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
         }
-        for attr in ("request_id", "path", "method", "status_code"):
-            value = getattr(record, attr, None)
+        record_dict = record.__dict__
+        for attr in self._CONTEXT_ATTRS:
+            value = record_dict.get(attr)
             if value is not None:
                 payload[attr] = value
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload)
+        return orjson.dumps(payload, default=str).decode()
 
 
 def configure_logging(level: str = "INFO") -> None:
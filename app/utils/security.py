@@ -0,0 +1,23 @@
+"""Request authentication helpers."""
+from __future__ import annotations
+
+import hmac
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Header
+
+from ..models import ServiceError
+
+
+def make_require_api_key(expected: Optional[str]) -> Callable[..., Awaitable[None]]:
+    """Return a dependency checking ``X-API-Key`` against ``expected``; an empty key disables the check."""
+    expected_bytes = expected.encode("utf-8") if expected else None
+
+    async def require_api_key(x_api_key: Optional[str] = Header(default=None)) -> None:
+        if expected_bytes is None:
+            return
+        # Constant-time comparison so response timing does not reveal how much of the key matched.
+        if not hmac.compare_digest((x_api_key or "").encode("utf-8"), expected_bytes):
+            raise ServiceError("Invalid or missing API key", "unauthorized", status_code=401)
+
+    return require_api_key
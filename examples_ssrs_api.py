@@ -5,12 +5,15 @@ Example: Using the SSRS RDL Generator API
 This script shows practical examples of generating SSRS RDL files from SQL queries.
 """
 
+import os
 import requests
 import json
 from pathlib import Path
 
 # Configure the API endpoint
 API_URL = "http://localhost:8000/report/ssrs-generate"
+# Sent as X-API-Key; required when the server is started with API_KEY set
+HEADERS = {"X-API-Key": os.environ["API_KEY"]} if os.getenv("API_KEY") else {}
 
 
 def generate_rdl(sql, output_path, db_name, report_name=None):
@@ -36,7 +39,7 @@ def generate_rdl(sql, output_path, db_name, report_name=None):
         payload["report_name"] = report_name
     
     try:
-        response = requests.post(API_URL, json=payload, timeout=30)
+        response = requests.post(API_URL, json=payload, headers=HEADERS, timeout=30)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -202,7 +205,7 @@ def example_5_custom_data_source():
     }
     
     try:
-        response = requests.post(API_URL, json=payload, timeout=30)
+        response = requests.post(API_URL, json=payload, headers=HEADERS, timeout=30)
         response.raise_for_status()
         result = response.json()
         
@@ -233,22 +236,28 @@ def verify_rdl_file(file_path):
     
     # Try to parse as XML
     try:
-        import xml.etree.ElementTree as ET
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        from lxml import etree
+        
+        # Stream the document once, counting key elements and freeing each subtree when done
+        counts = {'DataSource': 0, 'DataSet': 0, 'Tablix': 0}
+        root_tag = None
+        for event, element in etree.iterparse(str(path), events=('start', 'end')):
+            if event == 'start':
+                if root_tag is None:
+                    root_tag = element.tag
+                continue
+            local_name = element.tag.rpartition('}')[2]
+            if local_name in counts:
+                counts[local_name] += 1
+            element.clear()
         
         # Check namespace
-        if 'reporting/2016/01/reportdefinition' in root.tag:
+        if 'reporting/2016/01/reportdefinition' in root_tag:
             print(f"✅ Valid SSRS 2016+ RDL namespace")
         
-        # Count key elements
-        data_sources = root.findall('.//{*}DataSource')
-        data_sets = root.findall('.//{*}DataSet')
-        tablixes = root.findall('.//{*}Tablix')
-        
-        print(f"   DataSources: {len(data_sources)}")
-        print(f"   DataSets: {len(data_sets)}")
-        print(f"   Tablixes: {len(tablixes)}")
+        print(f"   DataSources: {counts['DataSource']}")
+        print(f"   DataSets: {counts['DataSet']}")
+        print(f"   Tablixes: {counts['Tablix']}")
         
         return True
         
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import orjson
 import pytest
 import requests
 
@@ -16,24 +17,33 @@ DEFAULTS = {
     "TEST_PROMPT": "total sales by month and region",
 }
 
-if ENV_PATH.exists():
-    for line in ENV_PATH.read_text().splitlines():
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, _, value = line.partition("=")
-        os.environ.setdefault(key.strip(), value.strip())
+try:
+    from dotenv import load_dotenv
+except ImportError:  # pragma: no cover - minimal client environments
+    if ENV_PATH.exists():
+        for line in ENV_PATH.read_text().splitlines():
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, _, value = line.partition("=")
+            os.environ.setdefault(key.strip(), value.strip())
+else:
+    load_dotenv(ENV_PATH, override=False)
 
 
 @dataclass
 class ApiClient:
     base_url: str
+    session: requests.Session = field(default_factory=requests.Session, repr=False)
 
     def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
         url = f"{self.base_url.rstrip('/')}{path}"
         headers = kwargs.pop("headers", {})
         headers.setdefault("Content-Type", "application/json")
+        api_key = os.getenv("API_KEY")
+        if api_key:
+            headers.setdefault("X-API-Key", api_key)
         try:
-            response = requests.request(method, url, headers=headers, timeout=10, **kwargs)
+            response = self.session.request(method, url, headers=headers, timeout=10, **kwargs)
         except requests.RequestException as exc:  # pragma: no cover - network only
             raise RuntimeError(f"HTTP {method} {url} failed: {exc}") from exc
         return response
@@ -41,7 +51,7 @@ class ApiClient:
     def get_json(self, path: str, **kwargs: Any) -> dict[str, Any]:
         response = self.request("GET", path, **kwargs)
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
         except ValueError as exc:  # pragma: no cover
             raise AssertionError(f"Non-JSON response from {path}: {response.text}") from exc
         return data
@@ -49,7 +59,7 @@ class ApiClient:
     def post_json(self, path: str, **kwargs: Any) -> tuple[requests.Response, dict[str, Any]]:
         response = self.request("POST", path, **kwargs)
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
         except ValueError:  # pragma: no cover
             data = {}
         return response, data
@@ -1,14 +1,17 @@
 """Imperative smoke test suite for the FastAPI backend."""
 from __future__ import annotations
 
-import json
 import os
 import sys
-import time
+from time import perf_counter_ns
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Callable
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 DEFAULT_ENV = {
     "API_BASE": "http://localhost:8000",
@@ -21,13 +24,18 @@ DEFAULT_ENV = {
 
 TIMEOUT = 10
 
+# Name fragments used to guess column roles and RDL types.
+_TIME_TOKS = ("date", "time")
+_MEASURE_TOKS = ("amount", "sales", "revenue", "count", "qty")
+_RDL_NUM_TOKS = ("amt", "amount", "sales", "revenue", "price", "qty", "count")
+
 
 def env(key: str) -> str:
     value = os.getenv(key)
     return value if value not in (None, "") else DEFAULT_ENV[key]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StepResult:
     name: str
     success: bool
@@ -39,6 +47,9 @@ class SmokeContext:
     def __init__(self) -> None:
         self.api_base = env("API_BASE").rstrip("/")
         self.headers = {"Content-Type": "application/json"}
+        # The server enforces X-API-Key whenever its own API_KEY is set.
+        if api_key := os.getenv("API_KEY"):
+            self.headers["X-API-Key"] = api_key
         self.db_name: str | None = None
         self.spec: dict[str, Any] | None = None
         self.mapping: list[dict[str, Any]] = []
@@ -48,15 +59,38 @@ class SmokeContext:
         self.publish_payload: dict[str, Any] | None = None
         self.summaries: list[StepResult] = []
         self.ssrs_warning: str | None = None
+        # One keep-alive session for every step; all requests target the same API_BASE.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Transient failures are retried with backoff for idempotent GETs only; POSTs such as
+        # publishReport must not be replayed, and their 502s carry meaning for the smoke result.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.25,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
         url = f"{self.api_base}{path}"
-        headers = kwargs.pop("headers", {})
-        headers = {**self.headers, **headers}
-        return requests.request(method, url, headers=headers, timeout=TIMEOUT, **kwargs)
+        return self.session.request(method, url, timeout=TIMEOUT, **kwargs)
+
+    def post_json(self, path: str, payload: dict[str, Any]) -> requests.Response:
+        # Encode straight to bytes; the session already sends Content-Type: application/json.
+        return self.request("POST", path, data=orjson.dumps(payload))
+
+    def close(self) -> None:
+        self.session.close()
 
     def record(self, name: str, func: Callable[[], None]) -> None:
-        start = time.time()
+        start = perf_counter_ns()
         try:
             func()
             success = True
@@ -64,7 +98,7 @@ class SmokeContext:
         except SoftFailure as exc:
             success = False
             message = str(exc)
-            self.summaries.append(StepResult(name, success, message, time.time() - start))
+            self.summaries.append(StepResult(name, success, message, _seconds_since(start)))
             self._exit_with_summary(code=2)
         except SsrsUnavailable as exc:
             success = True
@@ -73,10 +107,9 @@ class SmokeContext:
         except Exception as exc:  # pragma: no cover - CLI path
             success = False
             message = f"{exc}"
-            self.summaries.append(StepResult(name, success, message, time.time() - start))
+            self.summaries.append(StepResult(name, success, message, _seconds_since(start)))
             self._exit_with_summary(code=1, extra_message=f"{name} failed: {exc}")
-        duration = time.time() - start
-        self.summaries.append(StepResult(name, success, message, duration))
+        self.summaries.append(StepResult(name, success, message, _seconds_since(start)))
 
     def _exit_with_summary(self, code: int, extra_message: str | None = None) -> None:
         print_summary(self.summaries, self.ssrs_warning)
@@ -85,6 +118,11 @@ class SmokeContext:
         sys.exit(code)
 
 
+def _seconds_since(start_ns: int) -> float:
+    # perf_counter_ns is monotonic, so NTP adjustments cannot produce negative durations.
+    return (perf_counter_ns() - start_ns) / 1e9
+
+
 class SoftFailure(RuntimeError):
     """Raised when the smoke test should exit with warning (code 2)."""
 
@@ -95,23 +133,21 @@ class SsrsUnavailable(RuntimeError):
 
 def ensure_json(response: requests.Response) -> dict[str, Any]:
     try:
-        return response.json()
+        return orjson.loads(response.content)
     except ValueError as exc:  # pragma: no cover - network only
         raise RuntimeError(f"Non-JSON response: {response.status_code} {response.text}") from exc
 
 
 def step_customer_databases(ctx: SmokeContext) -> None:
-    for attempt in (1, 2):
-        resp = ctx.request("GET", "/report/customerDatabases")
-        if resp.status_code == 200:
-            data = ensure_json(resp)
-            databases = data.get("databases") or []
-            if not databases:
-                raise RuntimeError("No databases returned from /report/customerDatabases")
-            ctx.db_name = databases[0]["name"]
-            return
-        time.sleep(1 if attempt == 1 else 0)
-    raise RuntimeError(f"Failed to list databases: {resp.status_code} {resp.text}")
+    # Retries for transient 5xx/connection errors happen in the session's HTTPAdapter.
+    resp = ctx.request("GET", "/report/customerDatabases")
+    if resp.status_code != 200:
+        raise RuntimeError(f"Failed to list databases: {resp.status_code} {resp.text}")
+    data = ensure_json(resp)
+    databases = data.get("databases") or []
+    if not databases:
+        raise RuntimeError("No databases returned from /report/customerDatabases")
+    ctx.db_name = databases[0]["name"]
 
 
 def step_infer(ctx: SmokeContext) -> None:
@@ -121,7 +157,7 @@ def step_infer(ctx: SmokeContext) -> None:
         "title": env("TEST_REPORT_TITLE"),
         "text": env("TEST_PROMPT"),
     }
-    resp = ctx.request("POST", "/report/inferFromNaturalLanguage", json=payload)
+    resp = ctx.post_json("/report/inferFromNaturalLanguage", payload)
     if resp.status_code != 200:
         raise RuntimeError(f"Infer failed: {resp.status_code} {resp.text}")
     data = ensure_json(resp)
@@ -135,15 +171,16 @@ def step_infer(ctx: SmokeContext) -> None:
 
 
 def normalize_mapping(suggested: list[dict[str, Any]], columns: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    column_lookup = {col.get("name") or col.get("column"): col for col in columns}
+    known_columns = {col.get("name") or col.get("column") for col in columns}
     mapping: list[dict[str, Any]] = []
+    append = mapping.append
     for item in suggested:
         column = item.get("column") or item.get("source")
-        if not column or column not in column_lookup:
+        if not column or column not in known_columns:
             continue
-        mapping.append(
+        append(
             {
-                "term": item.get("term") or column.split(".")[-1],
+                "term": item.get("term") or column.rpartition(".")[2],
                 "column": column,
                 "role": item.get("role") or infer_role_from_column(column),
                 "grain": item.get("grain"),
@@ -152,11 +189,12 @@ def normalize_mapping(suggested: list[dict[str, Any]], columns: list[dict[str, A
     return mapping
 
 
+@lru_cache(maxsize=512)
 def infer_role_from_column(column: str) -> str:
     lowered = column.lower()
-    if any(tok in lowered for tok in ("date", "time")):
+    if any(tok in lowered for tok in _TIME_TOKS):
         return "time"
-    if any(tok in lowered for tok in ("amount", "sales", "revenue", "count", "qty")):
+    if any(tok in lowered for tok in _MEASURE_TOKS):
         return "measure"
     return "dimension"
 
@@ -164,7 +202,7 @@ def infer_role_from_column(column: str) -> str:
 def step_generate_sql(ctx: SmokeContext) -> None:
     assert ctx.db_name and ctx.spec and ctx.mapping
     payload = {"db": ctx.db_name, "mapping": ctx.mapping, "spec": ctx.spec}
-    resp = ctx.request("POST", "/report/generateSQL", json=payload)
+    resp = ctx.post_json("/report/generateSQL", payload)
     if resp.status_code != 200:
         raise RuntimeError(f"generateSQL failed: {resp.status_code} {resp.text}")
     data = ensure_json(resp)
@@ -185,14 +223,9 @@ def step_generate_sql(ctx: SmokeContext) -> None:
 def step_preview(ctx: SmokeContext) -> None:
     assert ctx.db_name and ctx.sql_text
     limit = int(env("TEST_PREVIEW_LIMIT"))
-    params_dict: dict[str, Any] = {}
-    for param in ctx.params:
-        name = param.get("name")
-        if not name:
-            continue
-        params_dict[name] = param.get("value") or ""
+    params_dict = {name: param.get("value") or "" for param in ctx.params if (name := param.get("name"))}
     payload = {"db": ctx.db_name, "sql": ctx.sql_text, "params": params_dict, "limit": limit}
-    resp = ctx.request("POST", "/report/preview", json=payload)
+    resp = ctx.post_json("/report/preview", payload)
     if resp.status_code != 200:
         raise RuntimeError(f"preview failed: {resp.status_code} {resp.text}")
     data = ensure_json(resp)
@@ -229,7 +262,7 @@ def step_publish(ctx: SmokeContext) -> None:
         "chart": chart,
     }
     ctx.publish_payload = payload
-    resp = ctx.request("POST", "/report/publishReport", json=payload)
+    resp = ctx.post_json("/report/publishReport", payload)
     data = ensure_json(resp)
     if resp.status_code == 200:
         render_url = data.get("render_url_pdf")
@@ -243,21 +276,25 @@ def step_publish(ctx: SmokeContext) -> None:
 
 def build_publish_columns(columns: list[dict[str, Any]]) -> list[dict[str, Any]]:
     result: list[dict[str, Any]] = []
+    append = result.append
     for idx, column in enumerate(columns):
-        result.append(
+        get = column.get
+        raw_name = get("name") or ""
+        name = raw_name or f"Field{idx}"
+        append(
             {
-                "name": column.get("name") or f"Field{idx}",
-                "source": column.get("source") or column.get("name") or f"Field{idx}",
-                "system_type_name": column.get("system_type_name"),
-                "rdlType": column.get("rdlType") or infer_rdl_type(column.get("name", "")),
-                "role": column.get("role") or infer_role_from_column(column.get("name", "")),
-                "display_name": column.get("display_name") or column.get("name") or f"Field {idx}",
-                "description": column.get("description"),
-                "include": column.get("include", True),
-                "agg": column.get("agg"),
-                "format": column.get("format") or "None",
-                "samples": column.get("samples"),
-                "null_pct": column.get("null_pct"),
+                "name": name,
+                "source": get("source") or name,
+                "system_type_name": get("system_type_name"),
+                "rdlType": get("rdlType") or infer_rdl_type(raw_name),
+                "role": get("role") or infer_role_from_column(raw_name),
+                "display_name": get("display_name") or raw_name or f"Field {idx}",
+                "description": get("description"),
+                "include": get("include", True),
+                "agg": get("agg"),
+                "format": get("format") or "None",
+                "samples": get("samples"),
+                "null_pct": get("null_pct"),
             }
         )
     return result
@@ -317,11 +354,12 @@ def build_publish_chart(columns: list[dict[str, Any]]) -> dict[str, Any] | None:
     }
 
 
+@lru_cache(maxsize=512)
 def infer_rdl_type(name: str) -> str:
     lowered = name.lower()
-    if any(tok in lowered for tok in ("date", "time")):
+    if any(tok in lowered for tok in _TIME_TOKS):
         return "DateTime"
-    if any(tok in lowered for tok in ("amt", "amount", "sales", "revenue", "price", "qty", "count")):
+    if any(tok in lowered for tok in _RDL_NUM_TOKS):
         return "Float"
     return "String"
 
@@ -343,11 +381,15 @@ def main() -> None:
         ("customerDatabases", lambda: step_customer_databases(ctx)),
         ("inferFromNaturalLanguage", lambda: step_infer(ctx)),
         ("generateSQL", lambda: step_generate_sql(ctx)),
+        # Publishing pushes to SSRS, so it only runs once preview has passed.
         ("preview", lambda: step_preview(ctx)),
         ("publishReport", lambda: step_publish(ctx)),
     ]
-    for name, func in steps:
-        ctx.record(name, func)
+    try:
+        for name, func in steps:
+            ctx.record(name, func)
+    finally:
+        ctx.close()
     print_summary(ctx.summaries, ctx.ssrs_warning)
 
 
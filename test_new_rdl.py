@@ -26,7 +26,7 @@ def test_rdl_generation():
     
     # Generate RDL
     print("Generating RDL...")
-    rdl = build_rdl(
+    rdl_bytes = build_rdl(
         report_name='TestReport',
         data_source_name='DataSource1',
         data_set_name='DataSet1',
@@ -36,28 +36,53 @@ def test_rdl_generation():
         fields=fields,
         parameters=[]
     )
+    rdl = rdl_bytes.decode('utf-8')
     
     # Write to file
     output_path = '/tmp/test_generated_rdl.xml'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(rdl)
+    with open(output_path, 'wb') as f:
+        f.write(rdl_bytes)
     
     print(f"✅ RDL generated successfully!")
     print(f"📄 Saved to: {output_path}")
     print(f"📏 Length: {len(rdl)} characters")
     
-    # Check for critical elements
+    # Check for critical elements and validate the XML in one streaming pass
+    from io import BytesIO
+    from xml.etree.ElementTree import ParseError, iterparse
+    
+    seen_tags = set()
+    keep_with_after = details_group = can_grow = rd_namespace = False
+    xml_error = None
+    try:
+        for event, item in iterparse(BytesIO(rdl_bytes), events=('start-ns', 'end')):
+            if event == 'start-ns':
+                if item == ('rd', 'http://schemas.microsoft.com/SQLServer/reporting/reportdesigner'):
+                    rd_namespace = True
+                continue
+            tag = item.tag.rpartition('}')[2]
+            seen_tags.add(tag)
+            if tag == 'KeepWithGroup' and item.text == 'After':
+                keep_with_after = True
+            elif tag == 'Group' and item.get('Name') == 'Details':
+                details_group = True
+            elif tag == 'CanGrow' and item.text == 'true':
+                can_grow = True
+            item.clear()
+    except ParseError as e:
+        xml_error = e
+    
     print("\n🔍 Checking for critical SSRS 2016+ structures:")
     checks = {
-        'ReportSections': '<ReportSections>' in rdl,
-        'Paragraphs': '<Paragraphs>' in rdl,
-        'TextRuns': '<TextRuns>' in rdl,
-        'TablixMember with KeepWithGroup': '<KeepWithGroup>After</KeepWithGroup>' in rdl,
-        'TablixMember with Group': '<Group Name="Details"' in rdl,
-        'Page element': '<Page>' in rdl,
-        'CanGrow property': '<CanGrow>true</CanGrow>' in rdl,
-        'Style element': '<Style>' in rdl,
-        'Proper namespace': 'xmlns:rd="http://schemas.microsoft.com/SQLServer/reporting/reportdesigner"' in rdl
+        'ReportSections': 'ReportSections' in seen_tags,
+        'Paragraphs': 'Paragraphs' in seen_tags,
+        'TextRuns': 'TextRuns' in seen_tags,
+        'TablixMember with KeepWithGroup': keep_with_after,
+        'TablixMember with Group': details_group,
+        'Page element': 'Page' in seen_tags,
+        'CanGrow property': can_grow,
+        'Style element': 'Style' in seen_tags,
+        'Proper namespace': rd_namespace
     }
     
     all_pass = True
@@ -67,14 +92,11 @@ def test_rdl_generation():
         if not result:
             all_pass = False
     
-    # Try to parse as XML
     print("\n🔍 XML Validation:")
-    try:
-        import xml.etree.ElementTree as ET
-        ET.fromstring(rdl)
+    if xml_error is None:
         print("  ✅ Valid XML structure")
-    except Exception as e:
-        print(f"  ❌ XML parsing error: {e}")
+    else:
+        print(f"  ❌ XML parsing error: {xml_error}")
         all_pass = False
     
     # Show first 1000 characters
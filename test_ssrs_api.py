@@ -6,13 +6,24 @@ This script demonstrates how to use the SSRS RDL generation endpoint.
 """
 
 import json
+import os
 import requests
 import sys
+from requests.adapters import HTTPAdapter
 
 # API endpoint
 BASE_URL = "http://127.0.0.1:8000"
 ENDPOINT = f"{BASE_URL}/report/ssrs-generate"
 
+# Shared session so the health check warms the connection reused by every test POST
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+# Required when the server is started with API_KEY set
+if os.getenv("API_KEY"):
+    SESSION.headers["X-API-Key"] = os.environ["API_KEY"]
+
 # Test cases
 test_cases = [
     {
@@ -50,7 +61,7 @@ def test_endpoint():
     
     # First, check if the server is running
     try:
-        health_response = requests.get(f"{BASE_URL}/healthz", timeout=5)
+        health_response = SESSION.get(f"{BASE_URL}/healthz", timeout=5)
         if health_response.status_code != 200:
             print("❌ Server is not healthy")
             return False
@@ -67,7 +78,7 @@ def test_endpoint():
         print("-" * 60)
         
         try:
-            response = requests.post(ENDPOINT, json=test_case['request'], timeout=10)
+            response = SESSION.post(ENDPOINT, json=test_case['request'], timeout=10)
             
             print(f"Status Code: {response.status_code}")
             
@@ -119,7 +130,7 @@ def test_validation():
     for test_case in invalid_cases:
         print(f"\nTest: {test_case['name']}")
         try:
-            response = requests.post(ENDPOINT, json=test_case['request'], timeout=5)
+            response = SESSION.post(ENDPOINT, json=test_case['request'], timeout=5)
             if response.status_code == 400:
                 print(f"✅ Correctly rejected with 400")
                 print(f"   Message: {response.json().get('detail', 'N/A')}")
@@ -137,12 +148,15 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
-    # Test main functionality
-    if not test_endpoint():
-        sys.exit(1)
-    
-    # Test validation
-    test_validation()
+    try:
+        # Test main functionality
+        if not test_endpoint():
+            sys.exit(1)
+        
+        # Test validation
+        test_validation()
+    finally:
+        SESSION.close()
     
     print("=" * 60)
     print("Testing complete!")
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+
+@pytest.fixture(autouse=True, scope="session")
+def test_environment():
+    os.environ.setdefault("SQLSERVER_CONN_STR", "")
+    os.environ.setdefault("SQLSERVER_HOST", "")
+    os.environ.setdefault("SQLSERVER_DATABASE", "")
+    os.environ.setdefault("SQLSERVER_USER", "")
+    os.environ.setdefault("SQLSERVER_PASSWORD", "")
+
+    from app import config
+
+    config.get_settings.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def app_instance(test_environment):
+    # Imported lazily so collecting tests does not build the FastAPI app.
+    from app.main import app
+
+    return app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app_instance):
+    transport = ASGITransport(app=app_instance)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
@@ -0,0 +1,74 @@
+import threading
+import types
+
+import httpx
+import pytest
+
+from app import azure_openai
+
+
+@pytest.fixture
+def aoai(monkeypatch):
+    settings = types.SimpleNamespace(
+        azure_openai_endpoint="https://aoai.test/",
+        azure_openai_api_key="key",
+        azure_openai_deployment="gpt",
+    )
+    monkeypatch.setattr(azure_openai, "get_settings", lambda: settings)
+    monkeypatch.setattr(azure_openai._post.retry, "sleep", lambda seconds: None)
+    azure_openai._response_cache.clear()
+    calls = []
+
+    def install(*responses):
+        def handler(request):
+            calls.append(request)
+            return responses[len(calls) - 1]
+
+        monkeypatch.setattr(azure_openai, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        return calls
+
+    yield install
+    azure_openai.close()
+    azure_openai._response_cache.clear()
+
+
+def _completion(content):
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+def test_chat_completion_retries_throttled_request(aoai):
+    calls = aoai(httpx.Response(429, json={"error": "throttled"}), _completion('{"ok": true}'))
+
+    content = azure_openai.chat_completion([{"role": "user", "content": "hi"}])
+
+    assert content == '{"ok": true}'
+    assert len(calls) == 2
+
+
+def test_chat_completion_does_not_retry_client_error(aoai):
+    calls = aoai(httpx.Response(400, json={"error": "bad request"}), _completion("unused"))
+
+    with pytest.raises(httpx.HTTPStatusError) as excinfo:
+        azure_openai.chat_completion([{"role": "user", "content": "hi"}])
+
+    assert excinfo.value.response.status_code == 400
+    assert len(calls) == 1
+
+
+def test_concurrent_first_calls_share_one_client(monkeypatch):
+    monkeypatch.setattr(azure_openai, "_client", None)
+    barrier = threading.Barrier(8)
+    clients = []
+
+    def first_call():
+        barrier.wait()
+        clients.append(azure_openai._get_client())
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in clients}) == 1
+    azure_openai.close()
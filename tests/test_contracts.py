@@ -1,22 +1,8 @@
-import os
-
-from app import config
-
-os.environ.setdefault("SQLSERVER_CONN_STR", "")
-os.environ.setdefault("SQLSERVER_HOST", "")
-os.environ.setdefault("SQLSERVER_DATABASE", "")
-os.environ.setdefault("SQLSERVER_USER", "")
-os.environ.setdefault("SQLSERVER_PASSWORD", "")
-config.get_settings.cache_clear()
-
-from app.main import app  # noqa: E402
-
 import pytest
-from httpx import ASGITransport, AsyncClient
 
 
 @pytest.mark.asyncio
-async def test_generate_sql_contract(monkeypatch):
+async def test_generate_sql_contract(client, monkeypatch):
     meta = [
         {
             "name": "dbo.FactSales.OrderDate",
@@ -55,9 +41,7 @@ async def test_generate_sql_contract(monkeypatch):
         },
     }
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.post("/report/generateSQL", json=payload)
+    response = await client.post("/report/generateSQL", json=payload)
     assert response.status_code == 200
     data = response.json()
     assert "SELECT" in data["sql"]
@@ -69,7 +53,7 @@ async def test_generate_sql_contract(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_publish_report_contract(monkeypatch):
+async def test_publish_report_contract(client, monkeypatch):
     monkeypatch.setattr(
         "app.routers.report.upload_rdl",
         lambda folder, name, rdl: {"path": f"{folder}/{name}", "id": "abc"},
@@ -135,9 +119,7 @@ async def test_publish_report_contract(monkeypatch):
         },
     }
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.post("/report/publishReport", json=payload)
+    response = await client.post("/report/publishReport", json=payload)
 
     assert response.status_code == 200
     data = response.json()
@@ -0,0 +1,41 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_customer_databases_returns_etag(client):
+    response = await client.get("/report/customerDatabases")
+
+    assert response.status_code == 200
+    assert response.json() == {"databases": [{"name": "DemoDW"}]}
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "private, max-age=60"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        "{etag}",
+        "W/{etag}",
+        '"stale", {etag}',
+        "*",
+    ],
+)
+async def test_customer_databases_not_modified(client, if_none_match):
+    etag = (await client.get("/report/customerDatabases")).headers["etag"]
+
+    response = await client.get(
+        "/report/customerDatabases", headers={"If-None-Match": if_none_match.format(etag=etag)}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_customer_databases_stale_etag_returns_body(client):
+    response = await client.get("/report/customerDatabases", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.json() == {"databases": [{"name": "DemoDW"}]}
@@ -0,0 +1,172 @@
+import types
+from collections import OrderedDict
+
+import pytest
+
+from app import db
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, sql, *params):
+        if self._conn.broken:
+            raise RuntimeError("connection is broken")
+        self._conn.pings += 1
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, autocommit=False):
+        self.autocommit = autocommit
+        self.broken = False
+        self.closed = False
+        self.pings = 0
+        self.rollback_error = None
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def rollback(self):
+        if self.rollback_error:
+            raise self.rollback_error
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    connections = []
+
+    def connect(conn_str, timeout, autocommit):
+        conn = _FakeConnection(autocommit)
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(db, "pyodbc", types.SimpleNamespace(connect=connect))
+    return connections
+
+
+def test_returned_connection_is_reused_without_ping(opened):
+    pool = db._ConnectionPool("DSN=test", autocommit=True)
+
+    first = pool.connect()
+    first.close()
+    second = pool.connect()
+
+    assert len(opened) == 1
+    assert second._raw is opened[0]
+    assert opened[0].pings == 0
+
+
+def test_idle_connection_is_pinged_and_broken_one_replaced(opened, monkeypatch):
+    monkeypatch.setattr(db, "_PING_IDLE_SECONDS", 0)
+    pool = db._ConnectionPool("DSN=test", autocommit=True)
+
+    pool.connect().close()
+    pool.connect().close()
+    assert opened[0].pings == 1
+
+    opened[0].broken = True
+    conn = pool.connect()
+
+    assert opened[0].closed
+    assert conn._raw is opened[1]
+
+
+def test_expired_connection_is_recycled(opened, monkeypatch):
+    monkeypatch.setattr(db, "_POOL_RECYCLE_SECONDS", 0)
+    pool = db._ConnectionPool("DSN=test", autocommit=True)
+
+    pool.connect().close()
+    conn = pool.connect()
+
+    assert opened[0].closed
+    assert conn._raw is opened[1]
+
+
+def test_failed_rollback_discards_connection(opened):
+    pool = db._ConnectionPool("DSN=test", autocommit=True)
+
+    conn = pool.connect()
+    opened[0].rollback_error = RuntimeError("rollback failed")
+    conn.close()
+    pool.connect()
+
+    assert opened[0].closed
+    assert len(opened) == 2
+
+
+def test_checkout_times_out_when_pool_is_exhausted(opened, monkeypatch):
+    monkeypatch.setattr(db, "_POOL_SIZE", 1)
+    monkeypatch.setattr(db, "_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(db, "_POOL_TIMEOUT_SECONDS", 0.01)
+    pool = db._ConnectionPool("DSN=test", autocommit=True)
+
+    first = pool.connect()
+    overflow = pool.connect()
+    with pytest.raises(RuntimeError, match="Timed out"):
+        pool.connect()
+
+    first.close()
+    overflow.close()
+
+    # Only _POOL_SIZE connections are kept idle; the extra one is closed on return.
+    assert opened[1].closed
+    assert pool.connect()._raw is opened[0]
+
+
+def test_returned_proxy_cannot_be_used(opened):
+    pool = db._ConnectionPool("DSN=test", autocommit=True)
+
+    conn = pool.connect()
+    conn.close()
+
+    with pytest.raises(RuntimeError, match="returned to the pool"):
+        conn.cursor()
+
+
+@pytest.fixture
+def configured(monkeypatch):
+    settings = types.SimpleNamespace(resolved_sql_conn_str="Driver={SQL};Database=master;")
+    monkeypatch.setattr(db, "get_settings", lambda: settings)
+    monkeypatch.setattr(db, "_pools", OrderedDict())
+
+
+def test_autocommit_is_opt_in_per_pool(opened, configured):
+
+    db.open_sql_connection("DemoDW").close()
+    db.open_sql_connection("DemoDW", autocommit=True).close()
+
+    assert [conn.autocommit for conn in opened] == [False, True]
+    assert len(db._pools) == 2
+
+
+def test_client_sql_connections_are_not_reused(opened):
+    pool = db._ConnectionPool("DSN=test")
+
+    pool.connect().close()
+    pool.connect().close()
+
+    assert len(opened) == 2
+    assert all(conn.closed for conn in opened)
+
+
+def test_least_recently_used_pool_is_disposed(opened, configured, monkeypatch):
+    monkeypatch.setattr(db, "_MAX_POOLS", 2)
+
+    db.open_sql_connection("A", autocommit=True).close()
+    db.open_sql_connection("B", autocommit=True).close()
+    db.open_sql_connection("A", autocommit=True).close()
+    db.open_sql_connection("C", autocommit=True).close()
+
+    assert [key[0] for key in db._pools] == ["Driver={SQL};Database=A;", "Driver={SQL};Database=C;"]
+    assert opened[1].closed
+    assert not opened[0].closed
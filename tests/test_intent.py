@@ -0,0 +1,70 @@
+import pytest
+
+from app import catalog, intent
+from app.routers import report
+
+
+def _failing_llm(text, title):
+    raise RuntimeError("AOAI unavailable")
+
+
+def test_parse_intent_reports_rules_fallback(monkeypatch):
+    monkeypatch.setattr(intent, "is_configured", lambda: True)
+    monkeypatch.setattr(intent, "parse_intent_llm", _failing_llm)
+
+    spec, fell_back = intent.parse_intent_with_fallback("revenue by region", "Sales")
+
+    assert fell_back is True
+    assert spec.metrics == ["revenue"]
+
+
+def test_parse_intent_without_aoai_is_not_a_fallback(monkeypatch):
+    monkeypatch.setattr(intent, "is_configured", lambda: False)
+
+    _, fell_back = intent.parse_intent_with_fallback("revenue by region", "Sales")
+
+    assert fell_back is False
+
+
+@pytest.mark.asyncio
+async def test_infer_does_not_cache_rules_fallback(client, monkeypatch):
+    monkeypatch.setattr(intent, "is_configured", lambda: True)
+    monkeypatch.setattr(intent, "parse_intent_llm", _failing_llm)
+    monkeypatch.setattr(report, "_load_columns", lambda db: (catalog.demo_columns(), True))
+    report._infer_cache.clear()
+
+    response = await client.post(
+        "/report/inferFromNaturalLanguage",
+        json={"db": "DemoDW", "text": "revenue by region last 3 months", "title": "Sales"},
+    )
+
+    assert response.status_code == 200
+    assert len(report._infer_cache) == 0
+
+    monkeypatch.setattr(intent, "is_configured", lambda: False)
+    response = await client.post(
+        "/report/inferFromNaturalLanguage",
+        json={"db": "DemoDW", "text": "revenue by region last 3 months", "title": "Sales"},
+    )
+
+    assert response.status_code == 200
+    assert len(report._infer_cache) == 1
+
+
+@pytest.mark.parametrize(
+    "text, metrics, dimensions",
+    [
+        ("sales by country", ["sales", "count"], ["country"]),
+        ("salesrep totals by customername", ["sales"], ["customer"]),
+        ("revenue for top products by productline", ["revenue"], ["product"]),
+        ("orders by subcategory", ["orders"], ["category"]),
+        ("regional revenue", ["revenue"], ["region"]),
+        ("ordersales by segment", ["sales", "orders"], ["segment"]),
+        ("top channels", ["count"], ["channel"]),
+    ],
+)
+def test_parse_intent_rules_keywords(text, metrics, dimensions):
+    spec = intent.parse_intent_rules(text, "Report")
+
+    assert spec.metrics == metrics
+    assert spec.dimensions == dimensions
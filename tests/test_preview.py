@@ -0,0 +1,76 @@
+import pytest
+
+from app.routers import report
+
+
+class _FakeCursor:
+    description = (("Region", str), ("Sales", float))
+
+    def execute(self, sql, values):
+        self.values = values
+
+    def fetchall(self):
+        return [("West", 1000.0), ("South", 2500.0)]
+
+
+class _FakeConnection:
+    def cursor(self):
+        return _FakeCursor()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def live_preview(monkeypatch):
+    monkeypatch.setattr(report, "sql_connection_available", lambda: True)
+    monkeypatch.setattr(report, "open_sql_connection", lambda db: _FakeConnection())
+
+
+@pytest.mark.asyncio
+async def test_preview_rows_layout(client, live_preview):
+    response = await client.post(
+        "/report/preview?cache_bypass=true",
+        json={"db": "DemoDW", "sql": "SELECT Region, Sales FROM dbo.FactSales"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "rows": [{"Region": "West", "Sales": 1000.0}, {"Region": "South", "Sales": 2500.0}],
+        "row_count": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_preview_columns_layout(client, live_preview):
+    response = await client.post(
+        "/report/preview?cache_bypass=true",
+        json={"db": "DemoDW", "sql": "SELECT Region, Sales FROM dbo.FactSales", "layout": "columns"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "columns": ["Region", "Sales"],
+        "data": [["West", 1000.0], ["South", 2500.0]],
+        "row_count": 2,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "layout, expected",
+    [
+        ("rows", {"rows": [{"message": "Preview unavailable in this environment"}], "row_count": 1}),
+        (
+            "columns",
+            {"columns": ["message"], "data": [["Preview unavailable in this environment"]], "row_count": 1},
+        ),
+    ],
+)
+async def test_preview_without_database(client, layout, expected):
+    response = await client.post(
+        "/report/preview", json={"db": "DemoDW", "sql": "SELECT 1", "layout": layout}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == expected
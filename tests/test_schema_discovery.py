@@ -0,0 +1,87 @@
+import types
+
+import pytest
+
+from app import schema_discovery
+from app.routers import report
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, sql, *params):
+        self._conn.executed.append(sql)
+
+    def fetchall(self):
+        # is_hidden, column_ordinal, name, is_nullable, system_type_id, system_type_name
+        return [(False, 1, "Region", True, 231, "nvarchar(50)"), (False, 2, "Sales", True, 60, "money")]
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def getinfo(self, info_type):
+        return "DemoDW"
+
+
+@pytest.fixture(autouse=True)
+def empty_describe_cache():
+    schema_discovery.clear_describe_cache()
+    yield
+    schema_discovery.clear_describe_cache()
+
+
+def test_describe_result_set_reuses_cached_schema():
+    conn = _FakeConnection()
+    sql = "SELECT Region, Sales FROM dbo.FactSales"
+
+    fields, note = schema_discovery.describe_result_set(sql, conn)
+    assert [(f.name, f.rdl_type) for f in fields] == [("Region", "System.String"), ("Sales", "System.Decimal")]
+    assert note is None
+    assert len(conn.executed) == 1
+
+    fields[0].name = "Mutated"
+    cached_fields, _ = schema_discovery.describe_result_set(sql, conn)
+    assert len(conn.executed) == 1
+    assert cached_fields[0].name == "Region"
+
+    looked_up, _ = schema_discovery.cached_result_set(sql, "DemoDW")
+    assert [f.name for f in looked_up] == ["Region", "Sales"]
+
+
+def test_clear_describe_cache_forces_a_new_describe():
+    conn = _FakeConnection()
+    sql = "SELECT Region, Sales FROM dbo.FactSales"
+
+    schema_discovery.describe_result_set(sql, conn)
+    schema_discovery.clear_describe_cache()
+
+    assert schema_discovery.cached_result_set(sql, "DemoDW") is None
+    schema_discovery.describe_result_set(sql, conn)
+    assert len(conn.executed) == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_catalog_clears_described_schemas(client, monkeypatch):
+    monkeypatch.setattr(report, "get_settings", lambda: types.SimpleNamespace(api_key="s3cret"))
+    conn = _FakeConnection()
+    sql = "SELECT Region, Sales FROM dbo.FactSales"
+    schema_discovery.describe_result_set(sql, conn)
+
+    response = await client.post("/report/admin/flush-catalog")
+
+    assert response.status_code == 200
+    assert schema_discovery.cached_result_set(sql, "DemoDW") is None
+
+
+@pytest.mark.asyncio
+async def test_flush_catalog_is_refused_without_api_key(client):
+    response = await client.post("/report/admin/flush-catalog")
+
+    assert response.status_code == 403
+    assert response.json()["error"]["code"] == "forbidden"
@@ -0,0 +1,60 @@
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.models import ServiceError, format_error
+from app.utils.security import make_require_api_key
+
+
+@pytest_asyncio.fixture
+async def secured_client():
+    app = FastAPI(dependencies=[Depends(make_require_api_key("s3cret"))])
+
+    @app.exception_handler(ServiceError)
+    async def handle(request, exc):
+        return JSONResponse(status_code=exc.status_code, content=format_error(exc.message, exc.code))
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, {"X-API-Key": "wrong"}, {"X-API-Key": ""}])
+async def test_missing_or_wrong_api_key_is_rejected(secured_client, headers):
+    response = await secured_client.get("/ping", headers=headers)
+
+    assert response.status_code == 401
+    assert response.json()["error"]["code"] == "unauthorized"
+
+
+@pytest.mark.asyncio
+async def test_correct_api_key_passes(secured_client):
+    response = await secured_client.get("/ping", headers={"X-API-Key": "s3cret"})
+
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expected", ["", None])
+async def test_empty_api_key_disables_the_check(expected):
+    require_api_key = make_require_api_key(expected)
+
+    assert await require_api_key(x_api_key=None) is None
+    assert await require_api_key(x_api_key="anything") is None
+
+
+@pytest.mark.asyncio
+async def test_wrong_api_key_raises_service_error():
+    require_api_key = make_require_api_key("s3cret")
+
+    with pytest.raises(ServiceError) as excinfo:
+        await require_api_key(x_api_key="s3cre")
+
+    assert excinfo.value.status_code == 401